@@ -8,7 +8,7 @@ from alembic import context
 from src.config import settings
 from src.database import Base
 
-from src.auth.models import RefreshSessionModel
+from src.auth.models import RefreshSessionModel, TokenRevocationModel
 from src.users.models import UserModel
 from src.access_control.access_roles.models import AccessRoleModel
 from src.access_control.business_elements.models import BusinessElementModel
@@ -0,0 +1,56 @@
+"""Refresh session expires_at
+
+Revision ID: a6ddbc1b93a3
+Revises: c94daa3cb5e7
+Create Date: 2026-10-18 10:10:42.512907
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a6ddbc1b93a3"
+down_revision: Union[str, Sequence[str], None] = "c94daa3cb5e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "refresh_sessions",
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        "UPDATE refresh_sessions "
+        "SET expires_at = created_at + expires_in * interval '1 second'"
+    )
+    op.alter_column("refresh_sessions", "expires_at", nullable=False)
+    op.create_index(
+        op.f("refresh_sessions_expires_at_idx"),
+        "refresh_sessions",
+        ["expires_at"],
+        unique=False,
+    )
+    op.drop_column("refresh_sessions", "expires_in")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "refresh_sessions",
+        sa.Column("expires_in", sa.Integer(), nullable=True),
+    )
+    op.execute(
+        "UPDATE refresh_sessions "
+        "SET expires_in = GREATEST(EXTRACT(EPOCH FROM expires_at - created_at), 0)"
+    )
+    op.alter_column("refresh_sessions", "expires_in", nullable=False)
+    op.drop_index(
+        op.f("refresh_sessions_expires_at_idx"), table_name="refresh_sessions"
+    )
+    op.drop_column("refresh_sessions", "expires_at")
@@ -0,0 +1,35 @@
+"""Refresh session user expiry index
+
+Revision ID: 5d2e8f41b7c6
+Revises: a6ddbc1b93a3
+Create Date: 2026-10-18 11:30:12.804113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2e8f41b7c6"
+down_revision: Union[str, Sequence[str], None] = "a6ddbc1b93a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "refresh_sessions_user_id_expires_at_idx",
+        "refresh_sessions",
+        ["user_id", "expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "refresh_sessions_user_id_expires_at_idx", table_name="refresh_sessions"
+    )
@@ -0,0 +1,82 @@
+"""Token revocations
+
+Revision ID: e3b9c07a5f12
+Revises: 5d2e8f41b7c6
+Create Date: 2026-10-18 12:45:03.117562
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b9c07a5f12"
+down_revision: Union[str, Sequence[str], None] = "5d2e8f41b7c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "token_revocations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("jti", sa.UUID(), nullable=True),
+        sa.Column(
+            "revoked_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "modified_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("token_revocations_user_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("token_revocations_pkey")),
+    )
+    op.create_index(
+        op.f("token_revocations_user_id_idx"),
+        "token_revocations",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("token_revocations_jti_idx"), "token_revocations", ["jti"], unique=False
+    )
+    op.create_index(
+        op.f("token_revocations_expires_at_idx"),
+        "token_revocations",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("token_revocations_expires_at_idx"), table_name="token_revocations"
+    )
+    op.drop_index(op.f("token_revocations_jti_idx"), table_name="token_revocations")
+    op.drop_index(
+        op.f("token_revocations_user_id_idx"), table_name="token_revocations"
+    )
+    op.drop_table("token_revocations")
@@ -0,0 +1,34 @@
+"""Created at id indexes
+
+Revision ID: 9f4c1a6d2b83
+Revises: e3b9c07a5f12
+Create Date: 2026-10-18 14:00:27.390456
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9f4c1a6d2b83"
+down_revision: Union[str, Sequence[str], None] = "e3b9c07a5f12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("users", "access_roles", "access_roles_rules", "business_elements")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(
+            f"{table}_created_at_id_idx", table, ["created_at", "id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f"{table}_created_at_id_idx", table_name=table)
@@ -0,0 +1,101 @@
+"""Compare per-call overhead of ad-hoc and cached DAO lookup statements.
+
+Runs the lookup shapes used on hot paths against an in-memory SQLite
+database, so the numbers are dominated by SQLAlchemy's statement
+construction and compilation rather than by the database. Run from the
+project root:
+
+    poetry run python -m benchmarks.dao_lookup
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.database import Base
+from src.dao import BaseDAO
+from src.users.dao import UserDAO
+from src.access_control.access_roles.models import AccessRoleModel
+from src.access_control.access_rules.dao import AccessRuleDAO
+from src.access_control.access_rules.models import AccessRuleModel
+from src.access_control.business_elements.dao import BusinessElementDAO
+from src.access_control.business_elements.models import BusinessElementModel
+from src.users.models import UserModel
+
+
+def seed(session: Session) -> dict[str, dict[str, Any]]:
+    role = AccessRoleModel(name="user")
+    element = BusinessElementModel(name="users")
+    session.add_all([role, element])
+    session.flush()
+
+    user = UserModel(
+        id=uuid4(),
+        name="name",
+        surname="surname",
+        patronymic="patronymic",
+        email="user@example.com",
+        hashed_password="hash",
+        access_role_id=role.id,
+    )
+    rule = AccessRuleModel(role_id=role.id, business_element_id=element.id)
+    session.add_all([user, rule])
+    session.commit()
+    return {
+        "user by id": {"id": user.id},
+        "rule by role+element": {
+            "role_id": role.id,
+            "business_element_id": element.id,
+        },
+        "element by name": {"name": element.name},
+    }
+
+
+def bench(func: Callable[[], Any], number: int) -> float:
+    """Microseconds per call."""
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    lookups = seed(session)
+    daos: dict[str, type[BaseDAO]] = {
+        "user by id": UserDAO,
+        "rule by role+element": AccessRuleDAO,
+        "element by name": BusinessElementDAO,
+    }
+
+    print(f"{'lookup':<24}{'ad-hoc us':>12}{'cached us':>12}{'speedup':>10}")
+    for name, params in lookups.items():
+        dao = daos[name]
+
+        def adhoc():
+            query = select(dao.model).filter_by(**params)
+            return session.execute(query).scalars().one_or_none()
+
+        def cached():
+            statement = dao.lookup_statement(*params)
+            return session.execute(statement, params).scalars().one_or_none()
+
+        assert adhoc() is cached() is not None
+        # Drop the identity map between runs so both paths build the entity.
+        adhoc_us = bench(lambda: (adhoc(), session.expunge_all()), args.number)
+        cached_us = bench(lambda: (cached(), session.expunge_all()), args.number)
+        print(
+            f"{name:<24}{adhoc_us:>12.1f}{cached_us:>12.1f}{adhoc_us / cached_us:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
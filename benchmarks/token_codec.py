@@ -0,0 +1,59 @@
+"""Compare encode/decode throughput of the access-token codecs.
+
+Run from the project root:
+
+    poetry run python -m benchmarks.token_codec
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from src.auth.tokens import HS256TokenCodec, JoseTokenCodec, TokenCodec
+
+SECRET_KEY = "benchmark-secret-key"
+
+
+def make_claims() -> dict:
+    return {
+        "sub": str(uuid4()),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+        "role": 1,
+        "perm_ver": "0123456789abcdef",
+    }
+
+
+def bench(codec: TokenCodec, number: int) -> tuple[float, float]:
+    claims = make_claims()
+    token = codec.encode(claims)
+
+    encode_seconds = timeit.timeit(lambda: codec.encode(claims), number=number)
+    decode_seconds = timeit.timeit(lambda: codec.decode(token), number=number)
+    return number / encode_seconds, number / decode_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    codecs: dict[str, TokenCodec] = {
+        "jose": JoseTokenCodec(SECRET_KEY, "HS256"),
+        "hs256": HS256TokenCodec(SECRET_KEY),
+    }
+
+    # Both codecs must accept each other's tokens before speed matters.
+    for producer in codecs.values():
+        token = producer.encode(make_claims())
+        for consumer in codecs.values():
+            consumer.decode(token)
+
+    print(f"{'codec':<8}{'encode ops/s':>16}{'decode ops/s':>16}")
+    for name, codec in codecs.items():
+        encode_ops, decode_ops = bench(codec, args.number)
+        print(f"{name:<8}{encode_ops:>16,.0f}{decode_ops:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ...database import Base
@@ -7,5 +7,7 @@ from ...database import Base
 class AccessRoleModel(Base):
     __tablename__ = "access_roles"
 
+    __table_args__ = (Index("access_roles_created_at_id_idx", "created_at", "id"),)
+
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(50), unique=True)
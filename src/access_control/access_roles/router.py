@@ -1,8 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, Path, status
+from fastapi import APIRouter, Depends, Query, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...database import Message
+from ...dao import CountMode
+from ...database import Message, get_session
 from ..dependencies import BusinessElement, PermissionAction, Permit
 
 from .models import AccessRoleModel
@@ -20,8 +22,9 @@ access_role_router = APIRouter(prefix="/access_roles", tags=["access_role"])
 )
 async def add_access_role(
     access_role: AccessRoleCreate,
+    session: AsyncSession = Depends(get_session),
 ) -> AccessRole:
-    return await AccessRoleService.add_access_role(access_role)
+    return await AccessRoleService.add_access_role(session, access_role)
 
 
 @access_role_router.post(
@@ -32,8 +35,9 @@ async def add_access_role(
 )
 async def add_access_roles(
     access_roles: list[AccessRoleCreate],
+    session: AsyncSession = Depends(get_session),
 ) -> list[AccessRole]:
-    return await AccessRoleService.add_access_roles(access_roles)
+    return await AccessRoleService.add_access_roles(session, access_roles)
 
 
 @access_role_router.get(
@@ -41,8 +45,11 @@ async def add_access_roles(
     dependencies=[Permit(BusinessElement.ACCESS_CONTROL, PermissionAction.READ_ALL)],
     response_model=AccessRole,
 )
-async def get_access_role(access_role_id: int = Path(...)) -> AccessRole:
-    return await AccessRoleService.get_access_role(access_role_id)
+async def get_access_role(
+    access_role_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
+) -> AccessRole:
+    return await AccessRoleService.get_access_role(session, access_role_id)
 
 
 @access_role_router.get(
@@ -53,16 +60,20 @@ async def get_access_role(access_role_id: int = Path(...)) -> AccessRole:
 async def get_access_roles(
     offset: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=5)] = 5,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountMode, Query()] = "exact",
     name: Annotated[str | None, Query(max_length=50)] = None,
+    session: AsyncSession = Depends(get_session),
 ) -> AccessRoles:
     filter = []
 
     if name:
         filter.append(AccessRoleModel.name.ilike(f"%{name}%"))
 
-    data = await AccessRoleService.get_access_roles(*filter, offset=offset, limit=limit)
-    count = await AccessRoleService.count_access_roles(*filter)
-    return AccessRoles(data=data, count=count)
+    data, total, next_cursor = await AccessRoleService.get_access_roles(
+        session, *filter, offset=offset, limit=limit, cursor=cursor, count=count
+    )
+    return AccessRoles(data=data, count=total, next_cursor=next_cursor)
 
 
 @access_role_router.put(
@@ -73,8 +84,11 @@ async def get_access_roles(
 async def update_access_role(
     access_role: AccessRoleUpdate,
     access_role_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> AccessRole:
-    return await AccessRoleService.update_access_role(access_role_id, access_role)
+    return await AccessRoleService.update_access_role(
+        session, access_role_id, access_role
+    )
 
 
 @access_role_router.delete(
@@ -84,6 +98,7 @@ async def update_access_role(
 )
 async def delete_access_role(
     access_role_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> Message:
-    await AccessRoleService.delete_access_role(access_role_id)
+    await AccessRoleService.delete_access_role(session, access_role_id)
     return Message(message="AccessRole deleted successfully")
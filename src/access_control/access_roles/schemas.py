@@ -19,3 +19,4 @@ class AccessRole(AccessRoleCreate):
 class AccessRoles(BaseModel):
     data: list[AccessRole]
     count: int
+    next_cursor: str | None = Field(default=None)
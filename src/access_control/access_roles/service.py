@@ -1,6 +1,9 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dao import CountMode
 from src.exceptions import EntityAlreadyExists, EntityNotFound
 
-from ...database import async_session_maker
+from ..permissions import permission_matrix
 from .schemas import AccessRoleCreate, AccessRoleUpdate
 from .models import AccessRoleModel
 from .dao import AccessRoleDAO
@@ -8,33 +11,32 @@ from .dao import AccessRoleDAO
 
 class AccessRoleService:
     @classmethod
-    async def add_access_role(cls, access_role: AccessRoleCreate) -> AccessRoleModel:
-        async with async_session_maker() as session:
-            access_role_exist = await AccessRoleDAO.find_one_or_none(
-                session, name=access_role.name
-            )
-            if access_role_exist:
-                raise EntityAlreadyExists("access_role")
-
-            db_access_role = await AccessRoleDAO.add(session, access_role)
-            await session.commit()
+    async def add_access_role(
+        cls, session: AsyncSession, access_role: AccessRoleCreate
+    ) -> AccessRoleModel:
+        db_access_role = await AccessRoleDAO.add_unique(session, access_role)
+        if db_access_role is None:
+            raise EntityAlreadyExists("access_role")
+        await session.commit()
+        permission_matrix.invalidate()
         return db_access_role
 
     @classmethod
     async def add_access_roles(
-        cls, access_roles: list[AccessRoleCreate]
+        cls, session: AsyncSession, access_roles: list[AccessRoleCreate]
     ) -> list[AccessRoleModel]:
-        async with async_session_maker() as session:
-            db_access_roles = await AccessRoleDAO.add_bulk(session, access_roles)
-            await session.commit()
+        db_access_roles = await AccessRoleDAO.add_bulk(session, access_roles)
+        await session.commit()
+        permission_matrix.invalidate()
         return db_access_roles
 
     @classmethod
-    async def get_access_role(cls, access_role_id: int) -> AccessRoleModel:
-        async with async_session_maker() as session:
-            db_access_role = await AccessRoleDAO.find_one_or_none(
-                session, id=access_role_id
-            )
+    async def get_access_role(
+        cls, session: AsyncSession, access_role_id: int
+    ) -> AccessRoleModel:
+        db_access_role = await AccessRoleDAO.find_one_or_none(
+            session, id=access_role_id
+        )
         if db_access_role is None:
             raise EntityNotFound("access_role")
         return db_access_role
@@ -42,45 +44,49 @@ class AccessRoleService:
     @classmethod
     async def get_access_roles(
         cls,
+        session: AsyncSession,
         *filter,
         offset: int = 0,
         limit: int = 5,
+        cursor: str | None = None,
+        count: CountMode = "exact",
         **filter_by,
-    ) -> list[AccessRoleModel]:
-        async with async_session_maker() as session:
-            access_roles = await AccessRoleDAO.find_all(
-                session, offset=offset, limit=limit, *filter, **filter_by
-            )
+    ) -> tuple[list[AccessRoleModel], int, str | None]:
+        access_roles, total, next_cursor = await AccessRoleDAO.find_page_with_count(
+            session,
+            *filter,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+            **filter_by,
+        )
         if not access_roles:
             raise EntityNotFound("access_role")
-        return access_roles
+        return access_roles, total, next_cursor
 
     @classmethod
     async def update_access_role(
-        cls, access_role_id: int, access_role: AccessRoleUpdate
+        cls, session: AsyncSession, access_role_id: int, access_role: AccessRoleUpdate
     ) -> AccessRoleModel:
-        async with async_session_maker() as session:
-            db_access_role = await AccessRoleDAO.find_one_or_none(
-                session, AccessRoleModel.id == access_role_id
-            )
-            if db_access_role is None:
-                raise EntityNotFound("access_role")
-
-            access_role_in = access_role.model_dump(exclude_unset=True)
-            access_role_update = await AccessRoleDAO.update(
-                session, AccessRoleModel.id == access_role_id, object_in=access_role_in
-            )
-            await session.commit()
+        access_role_in = access_role.model_dump(exclude_unset=True)
+        access_role_update = await AccessRoleDAO.update(
+            session, AccessRoleModel.id == access_role_id, object_in=access_role_in
+        )
+        if access_role_update is None:
+            raise EntityNotFound("access_role")
+        await session.commit()
+        permission_matrix.invalidate()
         return access_role_update
 
     @classmethod
-    async def delete_access_role(cls, access_role_id: int) -> None:
-        async with async_session_maker() as session:
-            await AccessRoleDAO.delete(session, AccessRoleModel.id == access_role_id)
-            await session.commit()
-
-    @classmethod
-    async def count_access_roles(cls, *filter, **filter_by) -> int:
-        async with async_session_maker() as session:
-            count = await AccessRoleDAO.count(session, *filter, **filter_by)
-        return count or 0
+    async def delete_access_role(
+        cls, session: AsyncSession, access_role_id: int
+    ) -> None:
+        deleted = await AccessRoleDAO.delete(
+            session, AccessRoleModel.id == access_role_id
+        )
+        if not deleted:
+            raise EntityNotFound("access_role")
+        await session.commit()
+        permission_matrix.invalidate()
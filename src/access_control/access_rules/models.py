@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ...database import Base
@@ -11,6 +11,7 @@ class AccessRuleModel(Base):
         UniqueConstraint(
             "role_id", "business_element_id", name="uq_role_business_element"
         ),
+        Index("access_roles_rules_created_at_id_idx", "created_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -1,8 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, Path, status
+from fastapi import APIRouter, Depends, Query, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import Message
+from src.dao import CountMode
+from src.database import Message, get_session
 from src.access_control.dependencies import BusinessElement, PermissionAction, Permit
 
 from .schemas import AccessRule, AccessRuleCreate, AccessRuleUpdate, AccessRules
@@ -19,8 +21,9 @@ access_rule_router = APIRouter(prefix="/access_rules", tags=["access_rule"])
 )
 async def add_access_rule(
     access_rule: AccessRuleCreate,
+    session: AsyncSession = Depends(get_session),
 ) -> AccessRule:
-    return await AccessRuleService.add_access_rule(access_rule)
+    return await AccessRuleService.add_access_rule(session, access_rule)
 
 
 @access_rule_router.post(
@@ -31,8 +34,9 @@ async def add_access_rule(
 )
 async def add_access_rules(
     access_rules: list[AccessRuleCreate],
+    session: AsyncSession = Depends(get_session),
 ) -> list[AccessRule]:
-    return await AccessRuleService.add_access_rules(access_rules)
+    return await AccessRuleService.add_access_rules(session, access_rules)
 
 
 @access_rule_router.get(
@@ -40,8 +44,11 @@ async def add_access_rules(
     dependencies=[Permit(BusinessElement.ACCESS_CONTROL, PermissionAction.READ_ALL)],
     response_model=AccessRule,
 )
-async def get_access_rule(access_rule_id: int = Path(...)) -> AccessRule:
-    return await AccessRuleService.get_access_rule(access_rule_id)
+async def get_access_rule(
+    access_rule_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
+) -> AccessRule:
+    return await AccessRuleService.get_access_rule(session, access_rule_id)
 
 
 @access_rule_router.get(
@@ -52,10 +59,14 @@ async def get_access_rule(access_rule_id: int = Path(...)) -> AccessRule:
 async def get_access_rules(
     offset: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=5)] = 5,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountMode, Query()] = "exact",
+    session: AsyncSession = Depends(get_session),
 ) -> AccessRules:
-    data = await AccessRuleService.get_access_rules(offset=offset, limit=limit)
-    count = await AccessRuleService.count_access_rules()
-    return AccessRules(data=data, count=count)
+    data, total, next_cursor = await AccessRuleService.get_access_rules(
+        session, offset=offset, limit=limit, cursor=cursor, count=count
+    )
+    return AccessRules(data=data, count=total, next_cursor=next_cursor)
 
 
 @access_rule_router.put(
@@ -66,8 +77,11 @@ async def get_access_rules(
 async def update_access_rule(
     access_rule: AccessRuleUpdate,
     access_rule_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> AccessRule:
-    return await AccessRuleService.update_access_rule(access_rule_id, access_rule)
+    return await AccessRuleService.update_access_rule(
+        session, access_rule_id, access_rule
+    )
 
 
 @access_rule_router.delete(
@@ -77,6 +91,7 @@ async def update_access_rule(
 )
 async def delete_access_rule(
     access_rule_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> Message:
-    await AccessRuleService.delete_access_rule(access_rule_id)
+    await AccessRuleService.delete_access_rule(session, access_rule_id)
     return Message(message="AccessRule deleted successfully")
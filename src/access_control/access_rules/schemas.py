@@ -32,3 +32,4 @@ class AccessRule(AccessRuleCreate):
 class AccessRules(BaseModel):
     data: list[AccessRule]
     count: int
+    next_cursor: str | None = Field(default=None)
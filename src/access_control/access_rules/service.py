@@ -1,6 +1,9 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dao import CountMode
 from src.exceptions import EntityAlreadyExists, EntityNotFound
 
-from ...database import async_session_maker
+from ..permissions import permission_matrix
 from .schemas import AccessRuleCreate, AccessRuleUpdate
 from .models import AccessRuleModel
 from .dao import AccessRuleDAO
@@ -8,47 +11,32 @@ from .dao import AccessRuleDAO
 
 class AccessRuleService:
     @classmethod
-    async def add_access_rule(cls, access_rule: AccessRuleCreate) -> AccessRuleModel:
-        async with async_session_maker() as session:
-            access_rule_exist = await AccessRuleDAO.find_one_or_none(
-                session,
-                role_id=access_rule.role_id,
-                business_element_id=access_rule.business_element_id,
-            )
-            if access_rule_exist:
-                raise EntityAlreadyExists("access_rule")
-
-            db_access_rule = await AccessRuleDAO.add(session, access_rule)
-            await session.commit()
+    async def add_access_rule(
+        cls, session: AsyncSession, access_rule: AccessRuleCreate
+    ) -> AccessRuleModel:
+        db_access_rule = await AccessRuleDAO.add_unique(session, access_rule)
+        if db_access_rule is None:
+            raise EntityAlreadyExists("access_rule")
+        await session.commit()
+        permission_matrix.invalidate()
         return db_access_rule
 
     @classmethod
     async def add_access_rules(
-        cls, access_rules: list[AccessRuleCreate]
+        cls, session: AsyncSession, access_rules: list[AccessRuleCreate]
     ) -> list[AccessRuleModel]:
-        async with async_session_maker() as session:
-            db_access_rules = await AccessRuleDAO.add_bulk(session, access_rules)
-            await session.commit()
+        db_access_rules = await AccessRuleDAO.add_bulk(session, access_rules)
+        await session.commit()
+        permission_matrix.invalidate()
         return db_access_rules
 
     @classmethod
-    async def get_access_rule(cls, access_rule_id: int) -> AccessRuleModel:
-        async with async_session_maker() as session:
-            db_access_rule = await AccessRuleDAO.find_one_or_none(
-                session, id=access_rule_id
-            )
-        if db_access_rule is None:
-            raise EntityNotFound("access_rule")
-        return db_access_rule
-
-    @classmethod
-    async def get_access_rule_for_role_and_element(
-        cls, access_role_id: int, business_element_id: int
+    async def get_access_rule(
+        cls, session: AsyncSession, access_rule_id: int
     ) -> AccessRuleModel:
-        async with async_session_maker() as session:
-            db_access_rule = await AccessRuleDAO.find_one_or_none(
-                session, role_id=access_role_id, business_element_id=business_element_id
-            )
+        db_access_rule = await AccessRuleDAO.find_one_or_none(
+            session, id=access_rule_id
+        )
         if db_access_rule is None:
             raise EntityNotFound("access_rule")
         return db_access_rule
@@ -56,45 +44,49 @@ class AccessRuleService:
     @classmethod
     async def get_access_rules(
         cls,
+        session: AsyncSession,
         *filter,
         offset: int = 0,
         limit: int = 5,
+        cursor: str | None = None,
+        count: CountMode = "exact",
         **filter_by,
-    ) -> list[AccessRuleModel]:
-        async with async_session_maker() as session:
-            access_rules = await AccessRuleDAO.find_all(
-                session, offset=offset, limit=limit, *filter, **filter_by
-            )
+    ) -> tuple[list[AccessRuleModel], int, str | None]:
+        access_rules, total, next_cursor = await AccessRuleDAO.find_page_with_count(
+            session,
+            *filter,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+            **filter_by,
+        )
         if not access_rules:
             raise EntityNotFound("access_rule")
-        return access_rules
+        return access_rules, total, next_cursor
 
     @classmethod
     async def update_access_rule(
-        cls, access_rule_id: int, access_rule: AccessRuleUpdate
+        cls, session: AsyncSession, access_rule_id: int, access_rule: AccessRuleUpdate
     ) -> AccessRuleModel:
-        async with async_session_maker() as session:
-            db_access_rule = await AccessRuleDAO.find_one_or_none(
-                session, AccessRuleModel.id == access_rule_id
-            )
-            if db_access_rule is None:
-                raise EntityNotFound("access_rule")
-
-            access_rule_in = access_rule.model_dump(exclude_unset=True)
-            access_rule_update = await AccessRuleDAO.update(
-                session, AccessRuleModel.id == access_rule_id, object_in=access_rule_in
-            )
-            await session.commit()
+        access_rule_in = access_rule.model_dump(exclude_unset=True)
+        access_rule_update = await AccessRuleDAO.update(
+            session, AccessRuleModel.id == access_rule_id, object_in=access_rule_in
+        )
+        if access_rule_update is None:
+            raise EntityNotFound("access_rule")
+        await session.commit()
+        permission_matrix.invalidate()
         return access_rule_update
 
     @classmethod
-    async def delete_access_rule(cls, access_rule_id: int) -> None:
-        async with async_session_maker() as session:
-            await AccessRuleDAO.delete(session, AccessRuleModel.id == access_rule_id)
-            await session.commit()
-
-    @classmethod
-    async def count_access_rules(cls, *filter, **filter_by) -> int:
-        async with async_session_maker() as session:
-            count = await AccessRuleDAO.count(session, *filter, **filter_by)
-        return count or 0
+    async def delete_access_rule(
+        cls, session: AsyncSession, access_rule_id: int
+    ) -> None:
+        deleted = await AccessRuleDAO.delete(
+            session, AccessRuleModel.id == access_rule_id
+        )
+        if not deleted:
+            raise EntityNotFound("access_rule")
+        await session.commit()
+        permission_matrix.invalidate()
@@ -1,8 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, Path, status
+from fastapi import APIRouter, Depends, Query, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...database import Message
+from ...dao import CountMode
+from ...database import Message, get_session
 from ..dependencies import (
     BusinessElement as AccessElement,
     PermissionAction,
@@ -31,8 +33,9 @@ business_element_router = APIRouter(
 )
 async def add_business_element(
     business_element: BusinessElementCreate,
+    session: AsyncSession = Depends(get_session),
 ) -> BusinessElement:
-    return await BusinessElementService.add_business_element(business_element)
+    return await BusinessElementService.add_business_element(session, business_element)
 
 
 @business_element_router.post(
@@ -43,8 +46,11 @@ async def add_business_element(
 )
 async def add_business_elements(
     business_elements: list[BusinessElementCreate],
+    session: AsyncSession = Depends(get_session),
 ) -> list[BusinessElement]:
-    return await BusinessElementService.add_business_elements(business_elements)
+    return await BusinessElementService.add_business_elements(
+        session, business_elements
+    )
 
 
 @business_element_router.get(
@@ -52,8 +58,13 @@ async def add_business_elements(
     dependencies=[Permit(AccessElement.ACCESS_CONTROL, PermissionAction.READ_ALL)],
     response_model=BusinessElement,
 )
-async def get_business_element(business_element_id: int = Path(...)) -> BusinessElement:
-    return await BusinessElementService.get_business_element(business_element_id)
+async def get_business_element(
+    business_element_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
+) -> BusinessElement:
+    return await BusinessElementService.get_business_element(
+        session, business_element_id
+    )
 
 
 @business_element_router.get(
@@ -64,18 +75,20 @@ async def get_business_element(business_element_id: int = Path(...)) -> Business
 async def get_business_elements(
     offset: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=5)] = 5,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountMode, Query()] = "exact",
     name: Annotated[str | None, Query(max_length=50)] = None,
+    session: AsyncSession = Depends(get_session),
 ) -> BusinessElements:
     filter = []
 
     if name:
         filter.append(BusinessElementModel.name.ilike(f"%{name}%"))
 
-    data = await BusinessElementService.get_business_elements(
-        *filter, offset=offset, limit=limit
+    data, total, next_cursor = await BusinessElementService.get_business_elements(
+        session, *filter, offset=offset, limit=limit, cursor=cursor, count=count
     )
-    count = await BusinessElementService.count_business_elements(*filter)
-    return BusinessElements(data=data, count=count)
+    return BusinessElements(data=data, count=total, next_cursor=next_cursor)
 
 
 @business_element_router.put(
@@ -86,9 +99,10 @@ async def get_business_elements(
 async def update_business_element(
     business_element: BusinessElementUpdate,
     business_element_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> BusinessElement:
     return await BusinessElementService.update_business_element(
-        business_element_id, business_element
+        session, business_element_id, business_element
     )
 
 
@@ -99,6 +113,7 @@ async def update_business_element(
 )
 async def delete_business_element(
     business_element_id: int = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> Message:
-    await BusinessElementService.delete_business_element(business_element_id)
+    await BusinessElementService.delete_business_element(session, business_element_id)
     return Message(message="BusinessElement deleted successfully")
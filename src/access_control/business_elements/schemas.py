@@ -19,3 +19,4 @@ class BusinessElement(BusinessElementCreate):
 class BusinessElements(BaseModel):
     data: list[BusinessElement]
     count: int
+    next_cursor: str | None = Field(default=None)
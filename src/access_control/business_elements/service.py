@@ -1,6 +1,9 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dao import CountMode
 from src.exceptions import EntityAlreadyExists, EntityNotFound
 
-from ...database import async_session_maker
+from ..permissions import permission_matrix
 from .schemas import BusinessElementCreate, BusinessElementUpdate
 from .models import BusinessElementModel
 from .dao import BusinessElementDAO
@@ -9,52 +12,35 @@ from .dao import BusinessElementDAO
 class BusinessElementService:
     @classmethod
     async def add_business_element(
-        cls, business_element: BusinessElementCreate
+        cls, session: AsyncSession, business_element: BusinessElementCreate
     ) -> BusinessElementModel:
-        async with async_session_maker() as session:
-            business_element_exist = await BusinessElementDAO.find_one_or_none(
-                session, name=business_element.name
-            )
-            if business_element_exist:
-                raise EntityAlreadyExists("business_element")
-
-            db_business_element = await BusinessElementDAO.add(
-                session, business_element
-            )
-            await session.commit()
+        db_business_element = await BusinessElementDAO.add_unique(
+            session, business_element
+        )
+        if db_business_element is None:
+            raise EntityAlreadyExists("business_element")
+        await session.commit()
+        permission_matrix.invalidate()
         return db_business_element
 
     @classmethod
     async def add_business_elements(
-        cls, business_elements: list[BusinessElementCreate]
+        cls, session: AsyncSession, business_elements: list[BusinessElementCreate]
     ) -> list[BusinessElementModel]:
-        async with async_session_maker() as session:
-            db_business_elements = await BusinessElementDAO.add_bulk(
-                session, business_elements
-            )
-            await session.commit()
+        db_business_elements = await BusinessElementDAO.add_bulk(
+            session, business_elements
+        )
+        await session.commit()
+        permission_matrix.invalidate()
         return db_business_elements
 
     @classmethod
     async def get_business_element(
-        cls, business_element_id: int
-    ) -> BusinessElementModel:
-        async with async_session_maker() as session:
-            db_business_element = await BusinessElementDAO.find_one_or_none(
-                session, id=business_element_id
-            )
-        if db_business_element is None:
-            raise EntityNotFound("business_element")
-        return db_business_element
-
-    @classmethod
-    async def get_business_element_by_name(
-        cls, business_element_name: str
+        cls, session: AsyncSession, business_element_id: int
     ) -> BusinessElementModel:
-        async with async_session_maker() as session:
-            db_business_element = await BusinessElementDAO.find_one_or_none(
-                session, name=business_element_name
-            )
+        db_business_element = await BusinessElementDAO.find_one_or_none(
+            session, id=business_element_id
+        )
         if db_business_element is None:
             raise EntityNotFound("business_element")
         return db_business_element
@@ -62,49 +48,56 @@ class BusinessElementService:
     @classmethod
     async def get_business_elements(
         cls,
+        session: AsyncSession,
         *filter,
         offset: int = 0,
         limit: int = 5,
+        cursor: str | None = None,
+        count: CountMode = "exact",
         **filter_by,
-    ) -> list[BusinessElementModel]:
-        async with async_session_maker() as session:
-            business_elements = await BusinessElementDAO.find_all(
-                session, offset=offset, limit=limit, *filter, **filter_by
+    ) -> tuple[list[BusinessElementModel], int, str | None]:
+        business_elements, total, next_cursor = (
+            await BusinessElementDAO.find_page_with_count(
+                session,
+                *filter,
+                offset=offset,
+                limit=limit,
+                cursor=cursor,
+                count=count,
+                **filter_by,
             )
+        )
         if not business_elements:
             raise EntityNotFound("business_element")
-        return business_elements
+        return business_elements, total, next_cursor
 
     @classmethod
     async def update_business_element(
-        cls, business_element_id: int, business_element: BusinessElementUpdate
+        cls,
+        session: AsyncSession,
+        business_element_id: int,
+        business_element: BusinessElementUpdate,
     ) -> BusinessElementModel:
-        async with async_session_maker() as session:
-            db_business_element = await BusinessElementDAO.find_one_or_none(
-                session, BusinessElementModel.id == business_element_id
-            )
-            if db_business_element is None:
-                raise EntityNotFound("business_element")
-
-            business_element_in = business_element.model_dump(exclude_unset=True)
-            business_element_update = await BusinessElementDAO.update(
-                session,
-                BusinessElementModel.id == business_element_id,
-                object_in=business_element_in,
-            )
-            await session.commit()
+        business_element_in = business_element.model_dump(exclude_unset=True)
+        business_element_update = await BusinessElementDAO.update(
+            session,
+            BusinessElementModel.id == business_element_id,
+            object_in=business_element_in,
+        )
+        if business_element_update is None:
+            raise EntityNotFound("business_element")
+        await session.commit()
+        permission_matrix.invalidate()
         return business_element_update
 
     @classmethod
-    async def delete_business_element(cls, business_element_id: int) -> None:
-        async with async_session_maker() as session:
-            await BusinessElementDAO.delete(
-                session, BusinessElementModel.id == business_element_id
-            )
-            await session.commit()
-
-    @classmethod
-    async def count_business_elements(cls, *filter, **filter_by) -> int:
-        async with async_session_maker() as session:
-            count = await BusinessElementDAO.count(session, *filter, **filter_by)
-        return count or 0
+    async def delete_business_element(
+        cls, session: AsyncSession, business_element_id: int
+    ) -> None:
+        deleted = await BusinessElementDAO.delete(
+            session, BusinessElementModel.id == business_element_id
+        )
+        if not deleted:
+            raise EntityNotFound("business_element")
+        await session.commit()
+        permission_matrix.invalidate()
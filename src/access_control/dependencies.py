@@ -2,11 +2,10 @@ from enum import StrEnum
 
 from fastapi import Depends, HTTPException, status
 
-from .business_elements.service import BusinessElementService
-from .access_rules.service import AccessRuleService
-from ..users.models import UserModel
+from .permissions import PERMISSION_BITS, permission_matrix
 
 from ..auth.dependencies import get_current_user
+from ..auth.principal import Principal
 
 
 class BusinessElement(StrEnum):
@@ -27,7 +26,7 @@ class PermissionAction(StrEnum):
 
 
 def Permit(element: BusinessElement, action: PermissionAction):
-    async def inner(user: UserModel = Depends(get_current_user)):
+    async def inner(user: Principal = Depends(get_current_user)):
         return await allow(element, action, user)
 
     return Depends(inner)
@@ -36,13 +35,11 @@ def Permit(element: BusinessElement, action: PermissionAction):
 async def allow(
     element: BusinessElement,
     action: PermissionAction,
-    user: UserModel = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
-    business_element = await BusinessElementService.get_business_element_by_name(
-        element
-    )
+    await permission_matrix.ensure_fresh()
 
-    if not business_element:
+    if not permission_matrix.has_element(element):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Business element not found",
@@ -53,19 +50,15 @@ async def allow(
             status_code=status.HTTP_403_FORBIDDEN, detail="No access role assigned"
         )
 
-    access_rule = await AccessRuleService.get_access_rule_for_role_and_element(
-        user.access_role_id, business_element.id
-    )
+    permission_mask = permission_matrix.get_mask(user.access_role_id, element)
 
-    if not access_rule:
+    if permission_mask is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No access assigned",
         )
 
-    permission_field = f"{action.value}_permission"
-
-    if not getattr(access_rule, permission_field, False):
+    if not permission_mask & PERMISSION_BITS[action.value]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
     return True
@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import time
+
+from sqlalchemy import select
+
+from ..config import settings
+from ..database import async_session_maker, replica_session_maker
+from .access_roles.models import AccessRoleModel
+from .access_rules.models import AccessRuleModel
+from .business_elements.models import BusinessElementModel
+
+PERMISSION_ACTIONS = (
+    "read",
+    "read_all",
+    "create",
+    "update",
+    "update_all",
+    "delete",
+    "delete_all",
+)
+
+PERMISSION_BITS = {action: 1 << bit for bit, action in enumerate(PERMISSION_ACTIONS)}
+
+
+def compile_permission_mask(access_rule: AccessRuleModel) -> int:
+    mask = 0
+    for action, bit in PERMISSION_BITS.items():
+        if getattr(access_rule, f"{action}_permission", False):
+            mask |= bit
+    return mask
+
+
+class PermissionMatrix:
+    """In-process (role_id, business element name) -> permission bitmask map.
+
+    Services that write access roles, rules or business elements call
+    `invalidate()`; the matrix is then rebuilt on the next check. It is also
+    rebuilt once it is older than `ttl_seconds`, so writes made by other
+    worker processes are picked up eventually. Those TTL rebuilds read from
+    a replica; rebuilds after `invalidate()` read from the primary.
+
+    `version` is a digest of the loaded roles, elements and masks. It is the
+    same in every worker that sees the same data, so it can be embedded in
+    access tokens and compared later to detect permission changes.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._masks: dict[tuple[int, str], int] = {}
+        self._elements: frozenset[str] = frozenset()
+        self._roles: frozenset[int] = frozenset()
+        self.version: str | None = None
+        self._loaded_at: float | None = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self._dirty
+            or self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.ttl_seconds
+        )
+
+    async def load(self) -> None:
+        statement = select(AccessRuleModel, BusinessElementModel.name).join(
+            BusinessElementModel,
+            AccessRuleModel.business_element_id == BusinessElementModel.id,
+        )
+        # A local write needs the primary to be seen at once; periodic
+        # refreshes can read from a replica.
+        session_maker = async_session_maker if self._dirty else replica_session_maker
+        # Cleared before reading so that an invalidation racing with the load
+        # forces another rebuild instead of being lost.
+        self._dirty = False
+        try:
+            async with session_maker() as session:
+                roles = await session.scalars(select(AccessRoleModel.id))
+                elements = await session.scalars(select(BusinessElementModel.name))
+                rules = await session.execute(statement)
+
+                self._roles = frozenset(roles.all())
+                self._elements = frozenset(elements.all())
+                self._masks = {
+                    (access_rule.role_id, element_name): compile_permission_mask(
+                        access_rule
+                    )
+                    for access_rule, element_name in rules.all()
+                }
+        except Exception:
+            self._dirty = True
+            raise
+        self.version = self._compute_version()
+        self._loaded_at = time.monotonic()
+
+    def _compute_version(self) -> str:
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(repr(sorted(self._roles)).encode())
+        digest.update(repr(sorted(self._elements)).encode())
+        digest.update(repr(sorted(self._masks.items())).encode())
+        return digest.hexdigest()
+
+    async def ensure_fresh(self) -> None:
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if self.is_stale:
+                await self.load()
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def has_element(self, element_name: str) -> bool:
+        return element_name in self._elements
+
+    def get_mask(self, role_id: int, element_name: str) -> int | None:
+        return self._masks.get((role_id, element_name))
+
+
+permission_matrix = PermissionMatrix(settings.PERMISSION_MATRIX_TTL_SECONDS)
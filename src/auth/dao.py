@@ -1,7 +1,15 @@
-from .models import RefreshSessionModel
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Row, and_, delete, exists, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import RefreshSessionModel, TokenRevocationModel
+from ..users.models import UserModel
 from .schemas import (
     RefreshSessionCreate,
     RefreshSessionUpdate,
+    TokenRevocationCreate,
 )
 from ..dao import BaseDAO
 
@@ -10,3 +18,111 @@ class RefreshSessionDAO(
     BaseDAO[RefreshSessionModel, RefreshSessionCreate, RefreshSessionUpdate]
 ):
     model = RefreshSessionModel
+
+    @classmethod
+    async def delete_expired(cls, session: AsyncSession, limit: int) -> int:
+        # SKIP LOCKED lets several workers sweep concurrently without waiting
+        # on each other's batches.
+        expired = (
+            select(cls.model.id)
+            .where(cls.model.expires_at <= func.now())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            delete(cls.model).where(cls.model.id.in_(expired))
+        )
+        return result.rowcount
+
+    @classmethod
+    async def evict_oldest(cls, session: AsyncSession, user_id: UUID, keep: int) -> int:
+        """Delete all but the user's `keep` most recently issued sessions.
+
+        Rotation pushes `expires_at` forward, so ordering by it keeps the
+        sessions that were refreshed most recently.
+        """
+        oldest = (
+            select(cls.model.id)
+            .where(cls.model.user_id == user_id)
+            .order_by(cls.model.expires_at.desc(), cls.model.id.desc())
+            .offset(keep)
+            .with_for_update()
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            delete(cls.model).where(cls.model.id.in_(oldest))
+        )
+        return result.rowcount
+
+    @classmethod
+    async def rotate(
+        cls,
+        session: AsyncSession,
+        token: UUID,
+        *,
+        new_token: UUID,
+        expires_at: datetime,
+    ) -> Row[tuple[UUID, int | None]] | None:
+        """Swap a live refresh token for a new one in a single statement.
+
+        Concurrent rotations of the same token serialize on the row lock and
+        the loser no longer matches `refresh_token = :old`, so each token can
+        be used exactly once. The join on users refuses tokens of deactivated
+        accounts. Returns the owner's `(id, access_role_id)`, or None when the
+        token is unknown, already used, expired or its owner is inactive.
+        """
+        statement = (
+            update(cls.model)
+            .where(
+                cls.model.refresh_token == token,
+                cls.model.expires_at > func.now(),
+                UserModel.id == cls.model.user_id,
+                UserModel.is_active,
+            )
+            .values(refresh_token=new_token, expires_at=expires_at)
+            .returning(UserModel.id, UserModel.access_role_id)
+        )
+        result = await session.execute(statement)
+        return result.one_or_none()
+
+
+class TokenRevocationDAO(
+    BaseDAO[TokenRevocationModel, TokenRevocationCreate, TokenRevocationCreate]
+):
+    model = TokenRevocationModel
+
+    @classmethod
+    async def find_active(cls, session: AsyncSession) -> list[tuple[UUID, UUID | None]]:
+        statement = select(cls.model.user_id, cls.model.jti).where(
+            cls.model.expires_at > func.now()
+        )
+        result = await session.execute(statement)
+        return result.tuples().all()
+
+    @classmethod
+    async def is_revoked(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        jti: UUID | None,
+        issued_at: datetime,
+    ) -> bool:
+        # `iat` is truncated to whole seconds, so a token minted in the same
+        # second as a per-user revocation is treated as revoked.
+        revoked = and_(
+            cls.model.user_id == user_id,
+            cls.model.jti.is_(None),
+            cls.model.revoked_at >= issued_at,
+        )
+        if jti is not None:
+            revoked = or_(cls.model.jti == jti, revoked)
+        statement = select(exists().where(cls.model.expires_at > func.now(), revoked))
+        return await session.scalar(statement)
+
+    @classmethod
+    async def delete_expired(cls, session: AsyncSession) -> int:
+        result = await session.execute(
+            delete(cls.model).where(cls.model.expires_at <= func.now())
+        )
+        return result.rowcount
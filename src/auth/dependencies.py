@@ -1,46 +1,108 @@
+import hashlib
+import time
 from uuid import UUID
 
-from jose import jwt
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..users.models import UserModel
 from ..users.service import UserService
+from ..access_control.permissions import permission_matrix
+from .principal import Principal
 from .exceptions import (
     InvalidToken,
     InactiveUser,
 )
 from ..config import settings
+from ..cache import TTLCache
+from ..database import get_session
+from ..monitoring.metrics import registry
+from .revocation import token_revocation_list
+from .tokens import token_codec
 from .utils import CookieToken
 
 cookie_token = CookieToken()
 
+# Decoded claims keyed by token digest. Entries never outlive the token's own
+# `exp`, so an expired token always goes back through full verification.
+access_token_cache: TTLCache[bytes, dict] = TTLCache(
+    settings.ACCESS_TOKEN_CACHE_SIZE, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+registry.counter(
+    "access_token_cache_hits",
+    "Access tokens whose verified claims were served from the cache",
+    callback=lambda: access_token_cache.hits,
+)
+registry.counter(
+    "access_token_cache_misses",
+    "Access tokens that had to be verified and decoded",
+    callback=lambda: access_token_cache.misses,
+)
+
+
+def decode_access_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+    payload = access_token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = token_codec.decode(token)
+    ttl_seconds = payload.get("exp", 0) - time.time()
+    if ttl_seconds > 0:
+        access_token_cache.set(
+            key, payload, min(ttl_seconds, access_token_cache.ttl_seconds)
+        )
+    return payload
+
 
 async def get_current_user_id(token: str = Depends(cookie_token)) -> str | None:
     if token:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         return payload.get("sub")
     return None
 
 
-async def get_current_user(token: str = Depends(cookie_token)) -> UserModel | None:
+async def get_access_token_claims(token: str = Depends(cookie_token)) -> dict:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise InvalidToken
+        payload = decode_access_token(token)
+        UUID(payload.get("sub"))
     except Exception:
         raise InvalidToken
-    current_user = await UserService.get_user(UUID(user_id))
-    return current_user
+    return payload
+
+
+async def get_current_user(
+    payload: dict = Depends(get_access_token_claims),
+    session: AsyncSession = Depends(get_session),
+) -> Principal:
+    # Permit(...) and the route handlers depend on this same callable, so
+    # FastAPI resolves it once per request and shares the result.
+    user_id = UUID(payload["sub"])
+    try:
+        jti = UUID(payload["jti"]) if "jti" in payload else None
+    except (TypeError, ValueError):
+        raise InvalidToken
+    if await token_revocation_list.is_revoked(
+        session, user_id, jti, payload.get("iat", 0)
+    ):
+        raise InvalidToken
+
+    if settings.ACCESS_TOKEN_EMBED_ROLE and "perm_ver" in payload:
+        await permission_matrix.ensure_fresh()
+        # Tokens minted before the last role/rule change fall back to the DB.
+        # Login and refresh only mint tokens for active users, so a user
+        # deactivated since then is let through until the token expires.
+        if payload["perm_ver"] == permission_matrix.version:
+            return Principal(
+                id=user_id, is_active=True, access_role_id=payload.get("role")
+            )
+
+    return await UserService.get_principal(session, user_id)
 
 
 async def get_current_active_user(
-    current_user: UserModel = Depends(get_current_user),
-) -> UserModel:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise InactiveUser
     return current_user
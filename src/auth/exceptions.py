@@ -8,13 +8,6 @@ class InvalidToken(HTTPException):
         )
 
 
-class TokenExpired(HTTPException):
-    def __init__(self):
-        super().__init__(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
-        )
-
-
 class InvalidCredentials(HTTPException):
     def __init__(self):
         super().__init__(
@@ -44,3 +37,12 @@ class NotAuthenticated(HTTPException):
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+class PasswordHashingUnavailable(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
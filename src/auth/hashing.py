@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from ..config import settings
+from ..monitoring.metrics import registry
+from .exceptions import PasswordHashingUnavailable
+from .utils import get_password_hash, get_password_hashes, is_valid_password
+
+password_hash_seconds = registry.histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying a password, including queueing",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+password_hash_rejected = registry.counter(
+    "password_hash_rejected",
+    "Password hashing requests rejected because the queue was full",
+)
+
+
+class PasswordHasher:
+    """Runs bcrypt in a process pool so it never blocks the event loop.
+
+    At most `max_workers + max_queue` jobs are accepted at once; beyond that
+    callers fail fast with 503 instead of piling up behind the pool. Bulk
+    hashing is the exception: it waits for an idle worker instead, so it
+    never fails midway and never takes the queue slots logins rely on. With
+    `max_workers=0` the work runs inline, which is handy for scripts.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._job_done = asyncio.Condition()
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.pending - self.max_workers, 0)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(
+        self, func: Callable[..., Any], *args: Any, wait: bool = False
+    ) -> Any:
+        if self.max_workers <= 0:
+            return func(*args)
+
+        started_at = time.perf_counter()
+        if wait:
+            async with self._job_done:
+                await self._job_done.wait_for(lambda: self.pending < self.max_workers)
+        elif self.pending >= self.max_workers + self.max_queue:
+            password_hash_rejected.inc()
+            raise PasswordHashingUnavailable
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+            password_hash_seconds.observe(time.perf_counter() - started_at)
+            async with self._job_done:
+                self._job_done.notify()
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(is_valid_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def hash_many(self, passwords: list[str], batch_size: int = 16) -> list[str]:
+        """Hash on every idle worker, a small batch of passwords per job.
+
+        A batch is only submitted when a worker is free, so logins queued
+        behind a bulk hash wait for one batch rather than all of it, and a
+        busy pool slows the bulk hash down instead of failing it.
+        """
+        slots = asyncio.Semaphore(max(self.max_workers, 1))
+
+        async def run(batch: list[str]) -> list[str]:
+            async with slots:
+                return await self._run(get_password_hashes, batch, wait=True)
+
+        results = await asyncio.gather(
+            *(
+                run(passwords[start : start + batch_size])
+                for start in range(0, len(passwords), batch_size)
+            )
+        )
+        return [hashed for batch in results for hashed in batch]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+registry.gauge(
+    "password_hash_in_flight",
+    "Password hashing jobs accepted and not yet finished",
+    callback=lambda: password_hasher.pending,
+)
+registry.gauge(
+    "password_hash_queue_depth",
+    "Password hashing jobs waiting for a free worker process",
+    callback=lambda: password_hasher.queue_depth,
+)
@@ -1,6 +1,7 @@
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID as pgUUID
 
@@ -10,9 +11,31 @@ from ..database import Base
 class RefreshSessionModel(Base):
     __tablename__ = "refresh_sessions"
 
+    __table_args__ = (
+        Index("refresh_sessions_user_id_expires_at_idx", "user_id", "expires_at"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     refresh_token: Mapped[UUID] = mapped_column(pgUUID, index=True)
-    expires_in: Mapped[int] = mapped_column()
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
     user_id: Mapped[UUID] = mapped_column(
         pgUUID, ForeignKey("users.id", ondelete="CASCADE")
     )
+
+
+class TokenRevocationModel(Base):
+    """A revoked access token (`jti` set) or all of a user's tokens issued at
+    or before `revoked_at` (`jti` null). Rows are useless once `expires_at`
+    passes, since every token they cover has expired by then."""
+
+    __tablename__ = "token_revocations"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(
+        pgUUID, ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    jti: Mapped[UUID | None] = mapped_column(pgUUID, nullable=True, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
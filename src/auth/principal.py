@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated caller, resolved once per request from the access token."""
+
+    id: UUID
+    is_active: bool
+    access_role_id: int | None
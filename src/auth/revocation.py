@@ -0,0 +1,123 @@
+import hashlib
+import math
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import async_session_maker, replica_session_maker, uses_primary
+from .dao import TokenRevocationDAO
+
+
+class BloomFilter:
+    """Fixed-size set membership test with no false negatives."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.size = max(size, 8)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from two independent 64-bit halves.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class TokenRevocationList:
+    """Bloom filter over live access-token revocations, in front of the table.
+
+    A token whose `jti` and user are both absent from the filter is certainly
+    not revoked, which is the answer for nearly every request, so those skip
+    the database entirely. Filter hits are confirmed with a query on the
+    primary.
+
+    Revocations made in this worker are added to the filter immediately;
+    other workers see them after their next `load()`, which reads from a
+    replica and so may also trail by the replication lag. Until the first
+    load succeeds every check goes to the database.
+    """
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self, false_positive_rate: float):
+        self.false_positive_rate = false_positive_rate
+        self._filter: BloomFilter | None = None
+        # One list per load() in progress, collecting keys added meanwhile.
+        self._loading: list[list[str]] = []
+
+    async def load(self) -> None:
+        # A revocation committed while the table is being read can be missing
+        # from the snapshot, so keys added meanwhile are replayed into it.
+        added = []
+        self._loading.append(added)
+        try:
+            async with replica_session_maker() as session:
+                revocations = await TokenRevocationDAO.find_active(session)
+        finally:
+            self._loading = [keys for keys in self._loading if keys is not added]
+
+        # Headroom for revocations added locally before the next rebuild.
+        bloom = BloomFilter(
+            max(2 * len(revocations), self.MIN_CAPACITY), self.false_positive_rate
+        )
+        for user_id, jti in revocations:
+            bloom.add(self._key(user_id, jti))
+        for key in added:
+            bloom.add(key)
+        self._filter = bloom
+
+    @staticmethod
+    def _key(user_id: UUID, jti: UUID | None) -> str:
+        return f"jti:{jti}" if jti is not None else f"user:{user_id}"
+
+    def add(self, user_id: UUID, jti: UUID | None = None) -> None:
+        key = self._key(user_id, jti)
+        if self._filter is not None:
+            self._filter.add(key)
+        for added in self._loading:
+            added.append(key)
+
+    async def is_revoked(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        jti: UUID | None,
+        issued_at: int,
+    ) -> bool:
+        bloom = self._filter
+        if (
+            bloom is not None
+            and self._key(user_id, None) not in bloom
+            and (jti is None or self._key(user_id, jti) not in bloom)
+        ):
+            return False
+
+        issued_at = datetime.fromtimestamp(issued_at, timezone.utc)
+        if uses_primary(session):
+            return await TokenRevocationDAO.is_revoked(session, user_id, jti, issued_at)
+        # A replica may not have the revocation yet; never confirm against it.
+        async with async_session_maker() as primary_session:
+            return await TokenRevocationDAO.is_revoked(
+                primary_session, user_id, jti, issued_at
+            )
+
+
+token_revocation_list = TokenRevocationList(
+    settings.TOKEN_REVOCATION_FALSE_POSITIVE_RATE
+)
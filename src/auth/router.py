@@ -1,34 +1,55 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Response, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import Message
+from src.database import Message, get_session
 from ..users.schemas import UserCreate, User
 from ..users.service import UserService
 from .schemas import Token, LoginData
 from .service import AuthService
-from .dependencies import get_current_user, get_current_active_user
+from .dependencies import (
+    get_access_token_claims,
+    get_current_user,
+    get_current_active_user,
+)
+from .principal import Principal
+from .tokens import token_codec
 from .exceptions import InvalidCredentials
 from ..config import settings
 
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+@auth_router.get("/.well-known/jwks.json")
+async def get_jwks(response: Response) -> dict:
+    response.headers["Cache-Control"] = (
+        f"public, max-age={settings.JWKS_CACHE_MAX_AGE_SECONDS}"
+    )
+    return token_codec.jwks()
+
+
 @auth_router.post("/register", status_code=status.HTTP_201_CREATED, response_model=User)
-async def register(user: UserCreate) -> User:
-    return await UserService.register_new_user(user)
+async def register(
+    user: UserCreate,
+    session: AsyncSession = Depends(get_session),
+) -> User:
+    return await UserService.register_new_user(session, user)
 
 
 @auth_router.post("/login", response_model=Token)
 async def login(
     credentials: LoginData,
     response: Response,
+    session: AsyncSession = Depends(get_session),
 ) -> Token:
-    user = await AuthService.authenticate_user(credentials.email, credentials.password)
+    user = await AuthService.authenticate_user(
+        session, credentials.email, credentials.password
+    )
     if not user:
         raise InvalidCredentials
 
-    token = await AuthService.create_token(user.id)
+    token = await AuthService.create_token(session, user.id, user.access_role_id)
 
     response.set_cookie(
         "access_token",
@@ -50,13 +71,19 @@ async def login(
     dependencies=[Depends(get_current_active_user)],
     response_model=Message,
 )
-async def logout(request: Request, response: Response) -> Message:
+async def logout(
+    request: Request,
+    response: Response,
+    claims: dict = Depends(get_access_token_claims),
+    session: AsyncSession = Depends(get_session),
+) -> Message:
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
 
     refresh_token = request.cookies.get("refresh_token")
-    if refresh_token:
-        await AuthService.logout(UUID(refresh_token))
+    await AuthService.logout(
+        session, UUID(refresh_token) if refresh_token else None, claims
+    )
 
     return Message(message="Logged out successfully")
 
@@ -65,6 +92,7 @@ async def logout(request: Request, response: Response) -> Message:
 async def refresh_token(
     request: Request,
     response: Response,
+    session: AsyncSession = Depends(get_session),
 ) -> Token:
     refresh_cookie = request.cookies.get("refresh_token")
     if not refresh_cookie:
@@ -75,7 +103,7 @@ async def refresh_token(
     except ValueError:
         raise InvalidCredentials
 
-    new_token = await AuthService.refresh_token(refresh_token)
+    new_token = await AuthService.refresh_token(session, refresh_token)
 
     response.set_cookie(
         "access_token",
@@ -94,10 +122,12 @@ async def refresh_token(
 
 @auth_router.post("/abort", response_model=Message)
 async def abort_all_sessions(
-    response: Response, user: User = Depends(get_current_user)
+    response: Response,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> Message:
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
 
-    await AuthService.abort_all_sessions(user.id)
+    await AuthService.abort_all_sessions(session, user.id)
     return Message(message="All sessions was aborted")
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel, Field, EmailStr
@@ -5,7 +6,7 @@ from pydantic import BaseModel, Field, EmailStr
 
 class RefreshSessionCreate(BaseModel):
     refresh_token: UUID
-    expires_in: int
+    expires_at: datetime
     user_id: UUID
 
 
@@ -13,6 +14,12 @@ class RefreshSessionUpdate(RefreshSessionCreate):
     user_id: UUID | None = Field(None)
 
 
+class TokenRevocationCreate(BaseModel):
+    user_id: UUID
+    jti: UUID | None = Field(None)
+    expires_at: datetime
+
+
 class Token(BaseModel):
     access_token: str
     refresh_token: UUID
@@ -1,40 +1,41 @@
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta, timezone
 
-from jose import jwt
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .utils import is_valid_password
-from .schemas import (
-    RefreshSessionCreate,
-    RefreshSessionUpdate,
-    Token,
-)
+from .hashing import password_hasher
+from .tokens import token_codec
+from ..access_control.permissions import permission_matrix
+from .schemas import Token, TokenRevocationCreate
 from ..users.schemas import User
 from ..users.dao import UserDAO
-from .models import RefreshSessionModel
-from .dao import RefreshSessionDAO
-from .exceptions import InvalidToken, TokenExpired
-from ..database import async_session_maker
+from .session_store import refresh_session_store
+from .dao import TokenRevocationDAO
+from .revocation import token_revocation_list
+from .exceptions import InvalidToken
 from ..config import settings
+from ..monitoring.metrics import registry
+
+refresh_sessions_evicted = registry.counter(
+    "refresh_sessions_evicted",
+    "Refresh sessions evicted on login because the user hit the session cap",
+)
 
 
 class AuthService:
     @classmethod
-    async def create_token(cls, user_id: UUID) -> Token:
-        access_token = cls._create_access_token(user_id)
-        refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    async def create_token(
+        cls, session: AsyncSession, user_id: UUID, access_role_id: int | None = None
+    ) -> Token:
+        access_token = await cls._create_access_token(user_id, access_role_id)
         refresh_token = cls._create_refresh_token()
 
-        async with async_session_maker() as session:
-            await RefreshSessionDAO.add(
-                session,
-                RefreshSessionCreate(
-                    user_id=user_id,
-                    refresh_token=refresh_token,
-                    expires_in=refresh_token_expires.total_seconds(),
-                ),
-            )
-            await session.commit()
+        evicted = await refresh_session_store.create(
+            session, user_id, refresh_token, cls._refresh_token_expires_at()
+        )
+        await session.commit()
+        refresh_sessions_evicted.inc(evicted)
         return Token(
             access_token=f"Bearer {access_token}",
             refresh_token=refresh_token,
@@ -42,80 +43,125 @@ class AuthService:
         )
 
     @classmethod
-    async def logout(cls, token: UUID) -> None:
-        async with async_session_maker() as session:
-            refresh_session = await RefreshSessionDAO.find_one_or_none(
-                session, RefreshSessionModel.refresh_token == token
-            )
-            if refresh_session:
-                await RefreshSessionDAO.delete(session, id=refresh_session.id)
-            await session.commit()
-
-    @classmethod
-    async def refresh_token(cls, token: UUID) -> Token:
-        async with async_session_maker() as session:
-            refresh_session = await RefreshSessionDAO.find_one_or_none(
-                session, RefreshSessionModel.refresh_token == token
-            )
+    async def logout(
+        cls,
+        session: AsyncSession,
+        token: UUID | None,
+        access_token_claims: dict,
+        commit: bool = True,
+    ) -> None:
+        """Drop the refresh session and revoke the access token.
 
-            if refresh_session is None:
-                raise InvalidToken
-            if datetime.now(timezone.utc) >= refresh_session.created_at + timedelta(
-                seconds=refresh_session.expires_in
-            ):
-                await RefreshSessionDAO.delete(session, id=refresh_session.id)
-                raise TokenExpired
+        With `commit=False` the caller commits, so the logout can share a
+        transaction with other writes; the revocation reaches the in-process
+        filter only once that commit succeeds.
+        """
+        user_id = UUID(access_token_claims["sub"])
+        if token is not None:
+            await refresh_session_store.delete(session, user_id, token)
 
-            user = await UserDAO.find_one_or_none(session, id=refresh_session.user_id)
-            if user is None:
-                raise InvalidToken
-
-            access_token = cls._create_access_token(user.id)
-            refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-            refresh_token = cls._create_refresh_token()
-
-            await RefreshSessionDAO.update(
+        jti = access_token_claims.get("jti")
+        if jti is not None:
+            jti = UUID(jti)
+            await TokenRevocationDAO.add(
                 session,
-                RefreshSessionModel.id == refresh_session.id,
-                object_in=RefreshSessionUpdate(
-                    refresh_token=refresh_token,
-                    expires_in=refresh_token_expires.total_seconds(),
+                TokenRevocationCreate(
+                    user_id=user_id,
+                    jti=jti,
+                    expires_at=datetime.fromtimestamp(
+                        access_token_claims["exp"], timezone.utc
+                    ),
                 ),
             )
+            event.listen(
+                session.sync_session,
+                "after_commit",
+                lambda _: token_revocation_list.add(user_id, jti),
+                once=True,
+            )
+        if commit:
             await session.commit()
+
+    @classmethod
+    async def refresh_token(cls, session: AsyncSession, token: UUID) -> Token:
+        refresh_token = cls._create_refresh_token()
+        user = await refresh_session_store.rotate(
+            session, token, refresh_token, cls._refresh_token_expires_at()
+        )
+        if user is None:
+            raise InvalidToken
+        await session.commit()
+
+        access_token = await cls._create_access_token(user.id, user.access_role_id)
         return Token(
-            access_token=access_token, refresh_token=refresh_token, token_type="bearer"
+            access_token=f"Bearer {access_token}",
+            refresh_token=refresh_token,
+            token_type="bearer",
         )
 
     @classmethod
-    async def authenticate_user(cls, email: str, password: str) -> User | None:
-        async with async_session_maker() as session:
-            db_user = await UserDAO.find_one_or_none(session, email=email)
+    async def authenticate_user(
+        cls, session: AsyncSession, email: str, password: str
+    ) -> User | None:
+        db_user = await UserDAO.find_one_or_none(session, email=email)
         if (
             db_user
             and db_user.is_active
-            and is_valid_password(password, db_user.hashed_password)
+            and await password_hasher.verify(password, db_user.hashed_password)
         ):
             return db_user
         return None
 
     @classmethod
-    async def abort_all_sessions(cls, user_id: UUID):
-        async with async_session_maker() as session:
-            await RefreshSessionDAO.delete(
-                session, RefreshSessionModel.user_id == user_id
-            )
-            await session.commit()
+    async def abort_all_sessions(cls, session: AsyncSession, user_id: UUID):
+        await refresh_session_store.delete_all(session, user_id)
+        # Rejects every access token issued up to now; none outlives the row.
+        await TokenRevocationDAO.add(
+            session,
+            TokenRevocationCreate(
+                user_id=user_id,
+                expires_at=datetime.now(timezone.utc)
+                + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            ),
+        )
+        await session.commit()
+        token_revocation_list.add(user_id)
 
     @classmethod
-    def _create_access_token(cls, user_id: UUID) -> str:
+    async def delete_expired_sessions(cls, session: AsyncSession, limit: int) -> int:
+        deleted = await refresh_session_store.delete_expired(session, limit=limit)
+        await session.commit()
+        return deleted
+
+    @classmethod
+    async def delete_expired_revocations(cls, session: AsyncSession) -> int:
+        deleted = await TokenRevocationDAO.delete_expired(session)
+        await session.commit()
+        return deleted
+
+    @classmethod
+    async def _create_access_token(
+        cls, user_id: UUID, access_role_id: int | None = None
+    ) -> str:
+        now = datetime.now(timezone.utc)
         to_encode = {
             "sub": str(user_id),
-            "exp": datetime.now(timezone.utc)
-            + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            "jti": str(uuid4()),
+            "iat": now,
+            "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
         }
-        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        if settings.ACCESS_TOKEN_EMBED_ROLE and access_role_id is not None:
+            await permission_matrix.ensure_fresh()
+            to_encode["role"] = access_role_id
+            to_encode["perm_ver"] = permission_matrix.version
+        return token_codec.encode(to_encode)
 
     @classmethod
     def _create_refresh_token(cls) -> str:
         return uuid4()
+
+    @classmethod
+    def _refresh_token_expires_at(cls) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(
+            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+        )
@@ -0,0 +1,328 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from uuid import UUID
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import Settings, settings
+from ..users.dao import UserDAO
+from .dao import RefreshSessionDAO
+from .models import RefreshSessionModel
+from .principal import Principal
+from .schemas import RefreshSessionCreate
+
+
+class RefreshSessionStore(ABC):
+    """Where refresh sessions live.
+
+    Every method takes the request's DB session so the SQL backend can join
+    the caller's unit of work; the other backends ignore it. Callers still
+    commit the DB session afterwards.
+
+    `create` keeps at most `max_sessions_per_user` sessions per user (0 means
+    unlimited), evicting the ones closest to expiry, and returns how many it
+    evicted.
+    """
+
+    def __init__(self, max_sessions_per_user: int = 0):
+        self.max_sessions_per_user = max_sessions_per_user
+
+    @abstractmethod
+    async def create(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        token: UUID,
+        expires_at: datetime,
+    ) -> int: ...
+
+    @abstractmethod
+    async def rotate(
+        self,
+        session: AsyncSession,
+        token: UUID,
+        new_token: UUID,
+        expires_at: datetime,
+    ) -> Principal | None:
+        """Replace a live token exactly once.
+
+        Returns the owner, or None when the token is unknown, already used,
+        expired or its owner is missing or inactive.
+        """
+
+    @abstractmethod
+    async def delete(self, session: AsyncSession, user_id: UUID, token: UUID) -> None:
+        """Delete one of the user's sessions; other users' tokens are left alone."""
+
+    @abstractmethod
+    async def delete_all(self, session: AsyncSession, user_id: UUID) -> None: ...
+
+    async def delete_expired(self, session: AsyncSession, limit: int) -> int:
+        return 0
+
+    async def close(self) -> None:
+        pass
+
+    async def _active_owner(
+        self, session: AsyncSession, user_id: UUID
+    ) -> Principal | None:
+        # Backends outside Postgres cannot join users in the rotation itself.
+        user = await UserDAO.find_one_or_none(session, id=user_id)
+        if user is None or not user.is_active:
+            return None
+        return Principal(id=user.id, is_active=True, access_role_id=user.access_role_id)
+
+
+class SQLRefreshSessionStore(RefreshSessionStore):
+    async def create(self, session, user_id, token, expires_at):
+        await RefreshSessionDAO.add(
+            session,
+            RefreshSessionCreate(
+                user_id=user_id, refresh_token=token, expires_at=expires_at
+            ),
+        )
+        if not self.max_sessions_per_user:
+            return 0
+        return await RefreshSessionDAO.evict_oldest(
+            session, user_id, keep=self.max_sessions_per_user
+        )
+
+    async def rotate(self, session, token, new_token, expires_at):
+        owner = await RefreshSessionDAO.rotate(
+            session, token, new_token=new_token, expires_at=expires_at
+        )
+        if owner is None:
+            return None
+        return Principal(
+            id=owner.id, is_active=True, access_role_id=owner.access_role_id
+        )
+
+    async def delete(self, session, user_id, token):
+        await RefreshSessionDAO.delete(
+            session,
+            RefreshSessionModel.user_id == user_id,
+            RefreshSessionModel.refresh_token == token,
+        )
+
+    async def delete_all(self, session, user_id):
+        await RefreshSessionDAO.delete(session, RefreshSessionModel.user_id == user_id)
+
+    async def delete_expired(self, session, limit):
+        return await RefreshSessionDAO.delete_expired(session, limit=limit)
+
+
+class MemoryRefreshSessionStore(RefreshSessionStore):
+    """Process-local store for tests and single-process development."""
+
+    def __init__(self, max_sessions_per_user: int = 0):
+        super().__init__(max_sessions_per_user)
+        self._sessions: dict[UUID, tuple[UUID, datetime]] = {}
+        self._user_tokens: dict[UUID, set[UUID]] = {}
+
+    def _remove(self, token: UUID) -> UUID | None:
+        entry = self._sessions.pop(token, None)
+        if entry is None:
+            return None
+        user_id = entry[0]
+        tokens = self._user_tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._user_tokens[user_id]
+        return user_id
+
+    async def create(self, session, user_id, token, expires_at):
+        self._sessions[token] = (user_id, expires_at)
+        tokens = self._user_tokens.setdefault(user_id, set())
+        tokens.add(token)
+
+        excess = len(tokens) - self.max_sessions_per_user
+        if not self.max_sessions_per_user or excess <= 0:
+            return 0
+        oldest = sorted(tokens, key=lambda t: self._sessions[t][1])[:excess]
+        for evicted in oldest:
+            self._remove(evicted)
+        return excess
+
+    async def rotate(self, session, token, new_token, expires_at):
+        entry = self._sessions.get(token)
+        if entry is None or entry[1] <= datetime.now(timezone.utc):
+            return None
+        owner = await self._active_owner(session, entry[0])
+        # Another rotation may have used the token while the owner was loaded.
+        if owner is None or self._sessions.get(token) is not entry:
+            return None
+        self._remove(token)
+        await self.create(session, owner.id, new_token, expires_at)
+        return owner
+
+    async def delete(self, session, user_id, token):
+        if token in self._user_tokens.get(user_id, ()):
+            self._remove(token)
+
+    async def delete_all(self, session, user_id):
+        for token in self._user_tokens.pop(user_id, set()):
+            self._sessions.pop(token, None)
+
+    async def delete_expired(self, session, limit):
+        now = datetime.now(timezone.utc)
+        expired = [
+            token
+            for token, (_, expires_at) in self._sessions.items()
+            if expires_at <= now
+        ][:limit]
+        for token in expired:
+            self._remove(token)
+        return len(expired)
+
+
+class RedisRefreshSessionStore(RefreshSessionStore):
+    """Sessions in Redis, through a `redis.asyncio` client.
+
+    `refresh_session:<token>` holds the name of the owner's set and expires
+    natively at the session's expiry. `refresh_sessions:<user_id>` is a sorted
+    set of the user's tokens scored by expiry, used to revoke them all at once.
+    Multi-key changes run atomically on the server, and scripts receive every
+    key they touch in KEYS.
+    """
+
+    SESSION_PREFIX = "refresh_session:"
+    USER_PREFIX = "refresh_sessions:"
+
+    CREATE_SCRIPT = """
+    redis.call('SET', KEYS[1], KEYS[2], 'EXAT', ARGV[1])
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+    redis.call('ZADD', KEYS[2], ARGV[1], ARGV[3])
+    redis.call('EXPIREAT', KEYS[2], ARGV[1])
+    local cap = tonumber(ARGV[4])
+    local excess = redis.call('ZCARD', KEYS[2]) - cap
+    if cap == 0 or excess <= 0 then
+        return {}
+    end
+    local popped = redis.call('ZPOPMIN', KEYS[2], excess)
+    local evicted = {}
+    for i = 1, #popped, 2 do
+        evicted[#evicted + 1] = popped[i]
+    end
+    return evicted
+    """
+
+    # KEYS: old session, new session, the owner's set. The caller read the
+    # owner's set from the old session; it must still match when we run.
+    ROTATE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) ~= KEYS[3]
+        or not redis.call('ZSCORE', KEYS[3], ARGV[2]) then
+        return 0
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('SET', KEYS[2], KEYS[3], 'EXAT', ARGV[1])
+    redis.call('ZREM', KEYS[3], ARGV[2])
+    redis.call('ZADD', KEYS[3], ARGV[1], ARGV[3])
+    redis.call('EXPIREAT', KEYS[3], ARGV[1])
+    return 1
+    """
+
+    DELETE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == KEYS[2] then
+        redis.call('DEL', KEYS[1])
+        redis.call('ZREM', KEYS[2], ARGV[1])
+    end
+    return 1
+    """
+
+    def __init__(self, client: Redis, max_sessions_per_user: int = 0):
+        super().__init__(max_sessions_per_user)
+        self.client = client
+        self._create = client.register_script(self.CREATE_SCRIPT)
+        self._rotate = client.register_script(self.ROTATE_SCRIPT)
+        self._delete = client.register_script(self.DELETE_SCRIPT)
+
+    def _session_key(self, token: UUID) -> str:
+        return f"{self.SESSION_PREFIX}{token}"
+
+    def _user_key(self, user_id: UUID) -> str:
+        return f"{self.USER_PREFIX}{user_id}"
+
+    async def create(self, session, user_id, token, expires_at):
+        evicted = await self._create(
+            keys=[self._session_key(token), self._user_key(user_id)],
+            args=[
+                int(expires_at.timestamp()),
+                int(datetime.now(timezone.utc).timestamp()),
+                str(token),
+                self.max_sessions_per_user,
+            ],
+        )
+        # Evicted tokens are already out of the set, which rotate checks, so
+        # their leftover session keys are dead until deleted here.
+        if evicted:
+            await self.client.delete(*(self._session_key(t) for t in evicted))
+        return len(evicted)
+
+    async def rotate(self, session, token, new_token, expires_at):
+        session_key = self._session_key(token)
+        user_key = await self.client.get(session_key)
+        if user_key is None:
+            return None
+        owner = await self._active_owner(
+            session, UUID(user_key.removeprefix(self.USER_PREFIX))
+        )
+        if owner is None:
+            return None
+        rotated = await self._rotate(
+            keys=[session_key, self._session_key(new_token), user_key],
+            args=[int(expires_at.timestamp()), str(token), str(new_token)],
+        )
+        return owner if rotated else None
+
+    async def delete(self, session, user_id, token):
+        await self._delete(
+            keys=[self._session_key(token), self._user_key(user_id)],
+            args=[str(token)],
+        )
+
+    async def delete_all(self, session, user_id):
+        user_key = self._user_key(user_id)
+        tokens = await self.client.zrange(user_key, 0, -1)
+        if not tokens:
+            return
+        # Only the tokens read above are removed, so a session created in the
+        # meantime stays consistent instead of losing its entry in the set.
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(*(self._session_key(token) for token in tokens))
+            pipe.zrem(user_key, *tokens)
+            await pipe.execute()
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def create_redis_client(settings: Settings) -> Redis:
+    """A client whose pool waits for a free connection instead of failing.
+
+    Connects, reads and pool waits are bounded by REDIS_TIMEOUT_SECONDS, so
+    an unreachable server fails the request instead of hanging it.
+    `rediss://` URLs connect over TLS.
+    """
+    pool = BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+        decode_responses=True,
+    )
+    return Redis.from_pool(pool)
+
+
+def create_refresh_session_store(settings: Settings) -> RefreshSessionStore:
+    max_sessions = settings.MAX_REFRESH_SESSIONS_PER_USER
+    if settings.REFRESH_SESSION_STORE == "memory":
+        return MemoryRefreshSessionStore(max_sessions)
+    if settings.REFRESH_SESSION_STORE == "redis":
+        return RedisRefreshSessionStore(create_redis_client(settings), max_sessions)
+    return SQLRefreshSessionStore(max_sessions)
+
+
+refresh_session_store = create_refresh_session_store(settings)
@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from ..config import settings
+from ..database import async_session_maker
+from ..monitoring.metrics import registry
+from .revocation import token_revocation_list
+from .service import AuthService
+
+logger = logging.getLogger(__name__)
+
+refresh_sessions_swept = registry.counter(
+    "refresh_sessions_swept",
+    "Expired refresh sessions deleted by the background sweeper",
+)
+
+
+async def sweep_expired_refresh_sessions() -> int:
+    """Delete expired refresh sessions in small batches, pausing between them."""
+    batch_size = settings.REFRESH_SESSION_SWEEP_BATCH_SIZE
+    total = 0
+    while True:
+        async with async_session_maker() as session:
+            deleted = await AuthService.delete_expired_sessions(
+                session, limit=batch_size
+            )
+        total += deleted
+        refresh_sessions_swept.inc(deleted)
+        if deleted < batch_size:
+            return total
+        await asyncio.sleep(settings.REFRESH_SESSION_SWEEP_BATCH_DELAY_SECONDS)
+
+
+async def run_refresh_session_sweeper() -> None:
+    while True:
+        try:
+            deleted = await sweep_expired_refresh_sessions()
+            logger.info("Refresh session sweep removed %d expired sessions", deleted)
+        except Exception:
+            logger.exception("Refresh session sweep failed")
+        await asyncio.sleep(settings.REFRESH_SESSION_SWEEP_INTERVAL_SECONDS)
+
+
+async def run_token_revocation_refresher() -> None:
+    while True:
+        await asyncio.sleep(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+        try:
+            async with async_session_maker() as session:
+                await AuthService.delete_expired_revocations(session)
+            await token_revocation_list.load()
+        except Exception:
+            logger.exception("Token revocation list refresh failed")
@@ -0,0 +1,200 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from ..config import Settings, settings
+
+
+class TokenError(Exception):
+    pass
+
+
+class TokenCodec(ABC):
+    """Signs claims into a compact JWT and verifies them back."""
+
+    @abstractmethod
+    def encode(self, claims: dict[str, Any]) -> str: ...
+
+    @abstractmethod
+    def decode(self, token: str) -> dict[str, Any]: ...
+
+    def jwks(self) -> dict[str, Any]:
+        # Shared-secret codecs have nothing that may be published.
+        return {"keys": []}
+
+
+class JoseTokenCodec(TokenCodec):
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self._algorithms = [algorithm]
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            return jwt.decode(token, self.secret_key, algorithms=self._algorithms)
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+
+
+class JoseKeySetTokenCodec(TokenCodec):
+    """Asymmetric (RS*/ES*) codec with `kid` headers and key rotation.
+
+    Tokens are signed with the single active private key. Any key in the
+    verification set is accepted, so retired keys keep validating tokens
+    issued before a rotation until those expire. The public half of every
+    key is published as a JWKS for other services to verify locally.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        signing_key_id: str,
+        signing_key: str,
+        verification_keys: dict[str, str] | None = None,
+    ):
+        self.algorithm = algorithm
+        self.signing_key_id = signing_key_id
+        self._algorithms = [algorithm]
+        self._signing_key = jwk.construct(signing_key, algorithm)
+        self._headers = {"kid": signing_key_id}
+
+        self._verification_keys: dict[str, Key] = {
+            kid: jwk.construct(pem, algorithm).public_key()
+            for kid, pem in (verification_keys or {}).items()
+        }
+        self._verification_keys[signing_key_id] = self._signing_key.public_key()
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return jwt.encode(
+            claims, self._signing_key, algorithm=self.algorithm, headers=self._headers
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = self._verification_keys.get(kid)
+            if key is None:
+                raise TokenError("Unknown signing key")
+            return jwt.decode(token, key, algorithms=self._algorithms)
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+
+    def jwks(self) -> dict[str, Any]:
+        return {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "use": "sig", "alg": self.algorithm}
+                for kid, key in self._verification_keys.items()
+            ]
+        }
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class HS256TokenCodec(TokenCodec):
+    """Hand-rolled HS256 codec for the login/refresh hot path.
+
+    The HMAC key schedule and the header segment are computed once, claims are
+    serialized without whitespace, and verification is a single HMAC plus a
+    constant-time compare. Tokens are interchangeable with JoseTokenCodec.
+    """
+
+    HEADER = {"alg": "HS256", "typ": "JWT"}
+
+    def __init__(self, secret_key: str):
+        self._hmac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+        self._header = _b64encode(
+            json.dumps(self.HEADER, separators=(",", ":"), sort_keys=True).encode()
+        )
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return _b64encode(mac.digest())
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        payload = _b64encode(
+            json.dumps(claims, separators=(",", ":"), default=_json_default).encode()
+        )
+        signing_input = self._header + b"." + payload
+        return (signing_input + b"." + self._sign(signing_input)).decode()
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            raw = token.encode("ascii")
+            signing_input, signature = raw.rsplit(b".", 1)
+            header, payload = signing_input.split(b".")
+        except (UnicodeEncodeError, ValueError) as e:
+            raise TokenError("Malformed token") from e
+
+        if not hmac.compare_digest(self._sign(signing_input), signature):
+            raise TokenError("Signature verification failed")
+
+        try:
+            if header != self._header:
+                if json.loads(_b64decode(header)).get("alg") != "HS256":
+                    raise TokenError("Unexpected algorithm")
+            claims = json.loads(_b64decode(payload))
+        except (binascii.Error, ValueError, AttributeError) as e:
+            raise TokenError("Malformed token") from e
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token")
+
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None and (not isinstance(exp, (int, float)) or exp <= now):
+            raise TokenError("Signature has expired")
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            raise TokenError("The token is not yet valid")
+        return claims
+
+
+def create_token_codec(settings: Settings) -> TokenCodec:
+    if settings.ALGORITHM.startswith(("RS", "ES")):
+        if not (settings.JWT_SIGNING_KEY_ID and settings.JWT_SIGNING_KEY_FILE):
+            raise ValueError(
+                f"ALGORITHM={settings.ALGORITHM} requires "
+                "JWT_SIGNING_KEY_ID and JWT_SIGNING_KEY_FILE"
+            )
+        return JoseKeySetTokenCodec(
+            settings.ALGORITHM,
+            settings.JWT_SIGNING_KEY_ID,
+            Path(settings.JWT_SIGNING_KEY_FILE).read_text(),
+            {
+                kid: Path(path).read_text()
+                for kid, path in settings.JWT_VERIFICATION_KEY_FILES.items()
+            },
+        )
+    if settings.TOKEN_CODEC == "hs256":
+        if settings.ALGORITHM != "HS256":
+            raise ValueError("TOKEN_CODEC=hs256 requires ALGORITHM=HS256")
+        return HS256TokenCodec(settings.SECRET_KEY)
+    return JoseTokenCodec(settings.SECRET_KEY, settings.ALGORITHM)
+
+
+token_codec = create_token_codec(settings)
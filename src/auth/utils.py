@@ -4,7 +4,6 @@ from fastapi import Request
 
 from .exceptions import NotAuthenticated
 
-
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -29,3 +28,7 @@ def is_valid_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return password_context.hash(password)
+
+
+def get_password_hashes(passwords: list[str]) -> list[str]:
+    return [password_context.hash(password) for password in passwords]
@@ -0,0 +1,59 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[KeyType, ValueType]):
+    """Bounded in-process LRU cache whose entries expire after a TTL.
+
+    Not shared between worker processes: every worker keeps its own copy, so
+    writers must invalidate locally and rely on the TTL for other workers.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[KeyType, tuple[float, ValueType]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: KeyType) -> ValueType | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self, key: KeyType, value: ValueType, ttl_seconds: float | None = None
+    ) -> None:
+        if self.maxsize <= 0:
+            return
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        self._data[key] = (time.monotonic() + ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: KeyType) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -27,11 +27,69 @@ class Settings(BaseSettings):
     def TEST_DATABASE_URL(self):
         return f"postgresql+asyncpg://{self.TEST_POSTGRES_USER}:{self.TEST_POSTGRES_PASSWORD}@{self.TEST_POSTGRES_HOST}:{self.TEST_POSTGRES_PORT}/{self.TEST_POSTGRES_DB}"
 
+    # Per engine and worker process: each worker can hold up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW connections to every database.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    # Connections older than this are replaced on checkout; -1 disables.
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache; set to 0 behind PgBouncer in
+    # transaction pooling mode.
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Kept below orchestrator probe timeouts.
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+
+    # Streaming replicas of the primary (full SQLAlchemy URLs). GET requests
+    # read from them unless a recent write pinned the client to the primary.
+    REPLICA_DATABASE_URLS: list[str] = []
+    # Read-your-writes window; should exceed the usual replication lag.
+    REPLICA_PIN_SECONDS: int = 5
+    # A replica that fails to connect is skipped for this long.
+    REPLICA_RETRY_SECONDS: int = 10
+
     SECRET_KEY: str
     ALGORITHM: str
+    TOKEN_CODEC: Literal["jose", "hs256"] = "jose"
+    # Asymmetric signing (ALGORITHM=RS256/ES256...): the active private key
+    # plus public keys of retired signing keys, both as PEM files keyed by kid.
+    JWT_SIGNING_KEY_ID: str | None = None
+    JWT_SIGNING_KEY_FILE: str | None = None
+    JWT_VERIFICATION_KEY_FILES: dict[str, str] = {}
+    JWKS_CACHE_MAX_AGE_SECONDS: int = 300
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     USER_SESSION_EXPIRE_DAYS: int = 30
+    # "sql" keeps sessions in Postgres, "memory" is process-local (tests only),
+    # "redis" uses REDIS_URL (Redis >= 6.2; rediss:// for TLS).
+    REFRESH_SESSION_STORE: Literal["sql", "memory", "redis"] = "sql"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 10
+    REDIS_TIMEOUT_SECONDS: float = 1
+    # Oldest sessions beyond this are evicted on login; 0 disables the cap.
+    MAX_REFRESH_SESSIONS_PER_USER: int = 10
+    # Other workers pick up a revocation when they next rebuild their filter.
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 30
+    TOKEN_REVOCATION_FALSE_POSITIVE_RATE: float = 0.01
+    REFRESH_SESSION_SWEEP_INTERVAL_SECONDS: int = 300
+    REFRESH_SESSION_SWEEP_BATCH_SIZE: int = 1000
+    REFRESH_SESSION_SWEEP_BATCH_DELAY_SECONDS: float = 0.1
+    # Embed signed `role` and `perm_ver` claims in access tokens so requests
+    # can be authorized without loading the user. Role reassignment or
+    # deactivation then only takes effect once the access token expires.
+    ACCESS_TOKEN_EMBED_ROLE: bool = False
+    ACCESS_TOKEN_CACHE_SIZE: int = 10000
+
+    PERMISSION_MATRIX_TTL_SECONDS: int = 60
+
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_EXPORT_BATCH_SIZE: int = 1000
+    USER_IMPORT_CHUNK_SIZE: int = 1000
 
     CORS_ORIGINS: list[str]
     CORS_HEADERS: list[str]
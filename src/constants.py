@@ -5,3 +5,6 @@ DB_NAMING_CONVENTION = {
     "fk": "%(table_name)s_%(column_0_name)s_fkey",
     "pk": "%(table_name)s_pkey",
 }
+
+# Role given to users created without one, by registration or bulk import.
+DEFAULT_ACCESS_ROLE_ID = 1
@@ -1,33 +1,154 @@
-from typing import Any, Dict, Generic, TypeVar, Union
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any, Dict, Generic, Literal, TypeVar, Union
 
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    insert,
+    literal,
+    select,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.sql import func
-from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from .database import Base
+from .exceptions import InvalidCursor
 
 
+CountMode = Literal["exact", "estimate"]
+
+# Planner statistics, refreshed by (auto)vacuum/analyze; -1 if never analyzed.
+pg_class = table("pg_class", column("oid"), column("reltuples"))
+
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# (model, sorted filter_by keys, projected columns) -> bind-parameterized
+# SELECT, built once per shape. No projection is an empty columns tuple.
+LookupKey = tuple[type[Base], tuple[str, ...], tuple[str, ...]]
+_lookup_statements: dict[LookupKey, Select] = {}
+
 
 class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     model = None
+    # Unique, indexed sort key for list queries. Cursors carry the last row's
+    # values for these columns, so a page starts with an index seek instead
+    # of scanning and discarding `offset` rows.
+    cursor_columns = ("created_at", "id")
+
+    @classmethod
+    def encode_cursor(cls, row: ModelType) -> str:
+        values = []
+        for name in cls.cursor_columns:
+            value = getattr(row, name)
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+        data = json.dumps(values, default=str, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+    @classmethod
+    def decode_cursor(cls, cursor: str) -> list[Any]:
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(data)
+            if not isinstance(values, list) or len(values) != len(cls.cursor_columns):
+                raise ValueError
+            decoded = []
+            for name, value in zip(cls.cursor_columns, values):
+                python_type = getattr(cls.model, name).type.python_type
+                if python_type is datetime:
+                    decoded.append(datetime.fromisoformat(value))
+                else:
+                    decoded.append(python_type(value))
+            return decoded
+        except (AttributeError, binascii.Error, TypeError, ValueError):
+            raise InvalidCursor
 
     @classmethod
     async def find_one_or_none(
         cls,
         session: AsyncSession,
         *filter,
+        columns: Sequence[str] | None = None,
         **filter_by,
-    ) -> ModelType | None:
-        statement = select(cls.model).filter(*filter).filter_by(**filter_by)
-        result = await session.execute(statement)
+    ) -> ModelType | Row | None:
+        """The single matching entity, or `None`.
+
+        With `columns` only those are selected and a plain `Row` is returned.
+        """
+        # Plain equality lookups reuse a prebuilt statement; SQLAlchemy then
+        # skips constructing the SELECT and finds it in the compiled cache.
+        if filter_by and not filter and None not in filter_by.values():
+            statement = cls.lookup_statement(*filter_by, columns=columns)
+            result = await session.execute(statement, filter_by)
+        else:
+            statement = cls._select(columns).filter(*filter).filter_by(**filter_by)
+            result = await session.execute(statement)
+        if columns:
+            return result.one_or_none()
         return result.scalars().one_or_none()
 
+    @classmethod
+    def _select(cls, columns: Sequence[str] | None = None) -> Select:
+        """`SELECT model`, or only the named columns of it."""
+        if not columns:
+            return select(cls.model)
+        return select(*(getattr(cls.model, name) for name in columns))
+
+    @classmethod
+    def lookup_statement(
+        cls, *names: str, columns: Sequence[str] | None = None
+    ) -> Select:
+        """`SELECT model WHERE name = :name AND ...`, cached per model and names.
+
+        Execute it with a `{name: value}` parameter dict.
+        """
+        key = (cls.model, tuple(sorted(names)), tuple(columns or ()))
+        statement = _lookup_statements.get(key)
+        if statement is None:
+            statement = cls._select(columns).where(
+                *(getattr(cls.model, name) == bindparam(name) for name in key[1])
+            )
+            _lookup_statements[key] = statement
+        return statement
+
+    @classmethod
+    async def find_many(
+        cls,
+        session: AsyncSession,
+        name: str,
+        keys: Sequence,
+        columns: Sequence[str] | None = None,
+    ) -> list[ModelType] | list[Row]:
+        """Rows whose `name` column is one of `keys`, in no particular order.
+
+        The keys travel as a single array parameter, so every batch size
+        shares one statement.
+        """
+        key_column = getattr(cls.model, name)
+        statement = cls._select(columns).where(
+            key_column == any_(bindparam("keys", type_=ARRAY(key_column.type)))
+        )
+        result = await session.execute(statement, {"keys": list(keys)})
+        if columns:
+            return result.all()
+        return result.scalars().all()
+
     @classmethod
     async def find_all(
         cls,
@@ -35,59 +156,201 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *filter,
         offset: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
+        columns: Sequence[str] | None = None,
         **filter_by,
-    ) -> list[ModelType]:
+    ) -> list[ModelType] | list[Row]:
+        """Rows ordered by `cursor_columns`.
+
+        Pass `cursor` (from `find_page`) to continue after a previous page;
+        `offset` is kept for backwards compatibility. With `columns` only
+        those are selected and plain `Row`s are returned.
+        """
+        statement = cls._paginate(
+            cls._select(columns).filter(*filter).filter_by(**filter_by),
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+        )
+        result = await session.execute(statement)
+        if columns:
+            return result.all()
+        return result.scalars().all()
+
+    @classmethod
+    def _paginate(
+        cls, statement: Select, offset: int, limit: int, cursor: str | None
+    ) -> Select:
+        columns = [getattr(cls.model, name) for name in cls.cursor_columns]
+        if cursor is not None:
+            values = [
+                literal(value, key.type)
+                for key, value in zip(columns, cls.decode_cursor(cursor))
+            ]
+            statement = statement.where(tuple_(*columns) > tuple_(*values))
+        return statement.order_by(*columns).offset(offset).limit(limit)
+
+    @classmethod
+    async def find_page(
+        cls,
+        session: AsyncSession,
+        *filter,
+        offset: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        columns: Sequence[str] | None = None,
+        **filter_by,
+    ) -> tuple[list[ModelType] | list[Row], str | None]:
+        """A page of `find_all` plus the cursor of the next one, if any."""
+        if columns:
+            # The next cursor is read from the last row.
+            columns = [
+                *columns,
+                *(name for name in cls.cursor_columns if name not in columns),
+            ]
+        rows = await cls.find_all(
+            session,
+            *filter,
+            offset=offset,
+            limit=limit + 1,
+            cursor=cursor,
+            columns=columns,
+            **filter_by,
+        )
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, cls.encode_cursor(rows[-1])
+
+    @classmethod
+    async def find_page_with_count(
+        cls,
+        session: AsyncSession,
+        *filter,
+        offset: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        **filter_by,
+    ) -> tuple[list[ModelType], int, str | None]:
+        """`find_page` plus the number of matching rows, in one statement.
+
+        The total is a window count over the filtered rows, or a scalar
+        subquery when a cursor would narrow the window. `count="estimate"`
+        reads the planner's row estimate instead of counting; it only applies
+        to unfiltered queries, where an exact count means a full scan.
+        """
+        estimate = count == "estimate" and not filter and not filter_by
+        if estimate:
+            total = (
+                select(cast(pg_class.c.reltuples, BigInteger))
+                .where(pg_class.c.oid == func.to_regclass(cls.model.__tablename__))
+                .scalar_subquery()
+            )
+        elif cursor is None:
+            total = func.count().over()
+        else:
+            total = (
+                select(func.count())
+                .select_from(cls.model)
+                .filter(*filter)
+                .filter_by(**filter_by)
+                .scalar_subquery()
+            )
+
+        statement = cls._paginate(
+            select(cls.model, total).filter(*filter).filter_by(**filter_by),
+            offset=offset,
+            limit=limit + 1,
+            cursor=cursor,
+        )
+        result = await session.execute(statement)
+        rows = result.all()
+
+        items = [row[0] for row in rows[:limit]]
+        total = rows[0][1] if rows else 0
+        if estimate and total < 0:
+            total = await cls.count(session)
+        next_cursor = cls.encode_cursor(items[-1]) if len(rows) > limit else None
+        return items, total, next_cursor
+
+    @classmethod
+    async def stream(
+        cls,
+        session: AsyncSession,
+        *filter,
+        columns: Sequence[str] | None = None,
+        batch_size: int = 1000,
+        **filter_by,
+    ) -> AsyncIterator[list]:
+        """Yield matching rows in batches read from a server-side cursor.
+
+        Only the current batch is held in memory. With `columns` the batches
+        hold plain rows instead of ORM objects.
+        """
+        order = [getattr(cls.model, name) for name in cls.cursor_columns]
         statement = (
-            select(cls.model)
+            cls._select(columns)
             .filter(*filter)
             .filter_by(**filter_by)
-            .offset(offset)
-            .limit(limit)
+            .order_by(*order)
+            .execution_options(yield_per=batch_size)
         )
-        result = await session.execute(statement)
-        return result.scalars().all()
+        if columns:
+            result = await session.stream(statement)
+        else:
+            result = await session.stream_scalars(statement)
+        async for partition in result.partitions():
+            yield partition
 
     @classmethod
     async def add(
         cls,
         session: AsyncSession,
         object_in: Union[CreateSchemaType, Dict[str, Any]],
-    ) -> ModelType | None:
+    ) -> ModelType:
         if isinstance(object_in, dict):
             create_data = object_in
         else:
             create_data = object_in.model_dump(exclude_unset=True)
 
-        try:
-            statement = insert(cls.model).values(**create_data).returning(cls.model)
-            result = await session.execute(statement)
-            return result.scalars().first()
-        except (SQLAlchemyError, Exception) as e:
-            if isinstance(e, SQLAlchemyError):
-                message = "Database Exc: Cannot insert data into table"
-            elif isinstance(e, Exception):
-                message = "Unknown Exc: Cannot insert data into table"
-
-            print(message)
-            return None
+        statement = insert(cls.model).values(**create_data).returning(cls.model)
+        result = await session.execute(statement)
+        return result.scalars().one()
 
     @classmethod
-    async def add_default(
+    async def add_unique(
         cls,
         session: AsyncSession,
+        object_in: Union[CreateSchemaType, Dict[str, Any]],
     ) -> ModelType | None:
-        try:
-            statement = insert(cls.model).returning(cls.model)
-            result = await session.execute(statement)
-            return result.scalars().first()
-        except (SQLAlchemyError, Exception) as e:
-            if isinstance(e, SQLAlchemyError):
-                message = "Database Exc: Cannot insert data into table"
-            elif isinstance(e, Exception):
-                message = "Unknown Exc: Cannot insert data into table"
+        """Insert a row, or return None if it violates a unique constraint.
+
+        The uniqueness check and the insert are one statement, so concurrent
+        creates cannot both succeed.
+        """
+        if isinstance(object_in, dict):
+            create_data = object_in
+        else:
+            create_data = object_in.model_dump(exclude_unset=True)
+
+        statement = (
+            pg_insert(cls.model)
+            .values(**create_data)
+            .on_conflict_do_nothing()
+            .returning(cls.model)
+        )
+        result = await session.execute(statement)
+        return result.scalars().one_or_none()
 
-            print(message)
-            return None
+    @classmethod
+    async def add_default(
+        cls,
+        session: AsyncSession,
+    ) -> ModelType:
+        statement = insert(cls.model).returning(cls.model)
+        result = await session.execute(statement)
+        return result.scalars().one()
 
     @classmethod
     async def delete(
@@ -95,9 +358,16 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         session: AsyncSession,
         *filter,
         **filter_by,
-    ) -> None:
-        statement = delete(cls.model).filter(*filter).filter_by(**filter_by)
-        await session.execute(statement)
+    ) -> list[ModelType]:
+        """Delete matching rows and return them; empty if nothing matched."""
+        statement = (
+            delete(cls.model)
+            .filter(*filter)
+            .filter_by(**filter_by)
+            .returning(cls.model)
+        )
+        result = await session.execute(statement)
+        return result.scalars().all()
 
     @classmethod
     async def update(
@@ -106,6 +376,7 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *where,
         object_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType | None:
+        """Update the row matching `where` and return it, or None if missing."""
         if isinstance(object_in, dict):
             update_data = object_in
         else:
@@ -115,43 +386,24 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             update(cls.model).where(*where).values(**update_data).returning(cls.model)
         )
         result = await session.execute(statement)
-        return result.scalars().one()
+        return result.scalars().one_or_none()
 
     @classmethod
     async def add_bulk(
         cls,
         session: AsyncSession,
         data: list[Dict[str, Any]],
-    ):
-        try:
-            result = await session.execute(insert(cls.model).returning(cls.model), data)
-            return result.scalars().all()
-        except (SQLAlchemyError, Exception) as e:
-            if isinstance(e, SQLAlchemyError):
-                message = "Database Exc"
-            elif isinstance(e, Exception):
-                message = "Unknown Exc"
-            message += ": Cannot bulk insert data into table"
-
-            return None
+    ) -> list[ModelType]:
+        result = await session.execute(insert(cls.model).returning(cls.model), data)
+        return result.scalars().all()
 
     @classmethod
     async def update_bulk(
         cls,
         session: AsyncSession,
         data: list[Dict[str, Any]],
-    ):
-        try:
-            await session.execute(update(cls.model), data)
-        except (SQLAlchemyError, Exception) as e:
-            if isinstance(e, SQLAlchemyError):
-                message = "Database Exc"
-            elif isinstance(e, Exception):
-                message = "Unknown Exc"
-            message += ": Cannot bulk update data into table"
-            print(message)
-
-            return None
+    ) -> None:
+        await session.execute(update(cls.model), data)
 
     @classmethod
     async def count(
@@ -1,13 +1,30 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from fastapi import Request, Response
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import DateTime, MetaData, NullPool, func
+from sqlalchemy import DateTime, MetaData, NullPool, event, func
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 
 from pydantic import BaseModel
 
 from .config import settings
 from .constants import DB_NAMING_CONVENTION
+from .monitoring.pool import InstrumentedPool, register_pool_gauges
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -28,13 +45,182 @@ class Message(BaseModel):
     message: str
 
 
+CONNECT_ARGS = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+
 if settings.MODE == "TEST":
     DATABASE_URL = settings.TEST_DATABASE_URL
+    REPLICA_DATABASE_URLS = []
     DATABASE_PARAMS = {"poolclass": NullPool}
 else:
     DATABASE_URL = settings.DATABASE_URL
-    DATABASE_PARAMS = {}
+    REPLICA_DATABASE_URLS = settings.REPLICA_DATABASE_URLS
+    DATABASE_PARAMS = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
-engine = create_async_engine(DATABASE_URL, **DATABASE_PARAMS)
+
+def _create_engine(name: str, url: str) -> AsyncEngine:
+    params = dict(DATABASE_PARAMS)
+    if params["poolclass"] is InstrumentedPool:
+        params["poolclass"] = InstrumentedPool.named(name)
+    engine = create_async_engine(
+        url, connect_args=CONNECT_ARGS, pool_logging_name=name, **params
+    )
+    if isinstance(engine.pool, InstrumentedPool):
+        register_pool_gauges(name, engine)
+    return engine
+
+
+engine = _create_engine("primary", DATABASE_URL)
 
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+replica_engines = [
+    _create_engine(f"replica{index}", url)
+    for index, url in enumerate(REPLICA_DATABASE_URLS)
+]
+_replica_session_makers = [
+    async_sessionmaker(replica, expire_on_commit=False) for replica in replica_engines
+]
+# Health checks connect outside the pools above, so a saturated pool is
+# reported as such instead of as the database being down.
+probe_engines = {
+    name: create_async_engine(url, connect_args=CONNECT_ARGS, poolclass=NullPool)
+    for name, url in [
+        ("primary", DATABASE_URL),
+        *((f"replica{index}", url) for index, url in enumerate(REPLICA_DATABASE_URLS)),
+    ]
+}
+_replica_order = itertools.cycle(range(len(replica_engines)))
+# Monotonic time until which each replica is skipped after a failed connect.
+_replica_down_until = [0.0] * len(replica_engines)
+
+
+def _mark_replica_down(index: int, error: BaseException) -> None:
+    _replica_down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+    logger.warning("Replica %d is unavailable: %s", index, error)
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    return isinstance(error, OSError) or (
+        isinstance(error, DBAPIError) and error.connection_invalidated
+    )
+
+
+async def _probe_replica(index: int) -> bool:
+    try:
+        async with asyncio.timeout(settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+            async with probe_engines[f"replica{index}"].connect():
+                pass
+    except (OSError, SQLAlchemyError) as e:
+        _mark_replica_down(index, e)
+        return False
+    return True
+
+
+async def _next_replica() -> int | None:
+    """Index of the next replica believed healthy, or None for the primary.
+
+    Replicas are tried round-robin, skipping any that failed to connect in
+    the last REPLICA_RETRY_SECONDS. Only a replica coming back from such a
+    failure is probed before use; healthy ones are not checked per request.
+    """
+    for _ in range(len(replica_engines)):
+        index = next(_replica_order)
+        down_until = _replica_down_until[index]
+        if down_until > time.monotonic():
+            continue
+        if down_until:
+            # Keep concurrent requests off the replica while it is probed.
+            _replica_down_until[index] = (
+                time.monotonic() + settings.REPLICA_RETRY_SECONDS
+            )
+            if not await _probe_replica(index):
+                continue
+            _replica_down_until[index] = 0.0
+        return index
+    return None
+
+
+@asynccontextmanager
+async def replica_session_maker() -> AsyncIterator[AsyncSession]:
+    """Like `async_session_maker()`, but on a replica when one is healthy.
+
+    Only for reads that tolerate replication lag. The session connects lazily
+    like any other; if the replica turns out to be unreachable, that use fails
+    and the replica is skipped for REPLICA_RETRY_SECONDS, with reads going to
+    the other replicas or the primary meanwhile.
+    """
+    index = await _next_replica()
+    if index is None:
+        async with async_session_maker() as session:
+            yield session
+        return
+
+    try:
+        async with _replica_session_makers[index]() as session:
+            yield session
+    except Exception as e:
+        if _is_connection_error(e):
+            _mark_replica_down(index, e)
+        raise
+
+
+def uses_primary(session: AsyncSession) -> bool:
+    return session.bind is engine
+
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+PRIMARY_PIN_COOKIE = "primary_pin_until"
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    try:
+        pinned_until = float(request.cookies.get(PRIMARY_PIN_COOKIE, 0))
+    except ValueError:
+        return False
+    # Bounded above, so a forged cookie cannot pin a client forever.
+    now = time.time()
+    return now < pinned_until <= now + settings.REPLICA_PIN_SECONDS
+
+
+def pin_to_primary(response: Response) -> None:
+    response.set_cookie(
+        PRIMARY_PIN_COOKIE,
+        str(time.time() + settings.REPLICA_PIN_SECONDS),
+        max_age=settings.REPLICA_PIN_SECONDS,
+        httponly=True,
+    )
+
+
+async def get_session(
+    request: Request, response: Response
+) -> AsyncIterator[AsyncSession]:
+    """Request-scoped unit of work shared by every dependency and service call.
+
+    Services commit explicitly; anything left uncommitted is rolled back when
+    the session closes after the response has been sent.
+
+    GET and HEAD requests read from a replica, or from the primary while no
+    replica is reachable (see `replica_session_maker`). A commit sets a
+    short-lived cookie that keeps the client's reads on the primary until the
+    replicas have caught up with the write.
+    """
+    if request.method in READ_METHODS and not is_pinned_to_primary(request):
+        session_scope = replica_session_maker()
+    else:
+        session_scope = async_session_maker()
+    async with session_scope as session:
+        if replica_engines:
+            event.listen(
+                session.sync_session,
+                "after_commit",
+                lambda _: pin_to_primary(response),
+                once=True,
+            )
+        yield session
@@ -15,3 +15,11 @@ class EntityNotFound(HTTPException):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="{} not found".format(entity_name).capitalize(),
         )
+
+
+class InvalidCursor(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
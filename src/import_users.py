@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from .auth.hashing import PasswordHasher
+from .database import async_session_maker
+from .users.service import UserService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(READ_SIZE):
+            yield chunk
+
+
+async def import_users(path: Path, format: str, workers: int) -> None:
+    # A private pool: the CLI does not share its CPUs with request handling.
+    hasher = PasswordHasher(max_workers=workers, max_queue=0)
+    try:
+        async with async_session_maker() as session:
+            report = await UserService.import_users(
+                session, read_file(path), format, hasher
+            )
+    finally:
+        hasher.shutdown()
+
+    for error in report.errors:
+        print(error.model_dump_json(exclude_none=True))
+    if report.errors_truncated:
+        logger.warning("Only the first %d errors are listed", report.MAX_ERRORS)
+    logger.info(
+        "Imported %d of %d users (%d duplicates, %d invalid)",
+        report.created,
+        report.total,
+        report.duplicates,
+        report.invalid,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.path.suffix == ".csv" else "ndjson")
+    asyncio.run(import_users(args.path, format, args.workers))
@@ -1,8 +1,11 @@
 import asyncio
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from .exceptions import EntityNotFound
 from .config import settings
+from .database import async_session_maker
 
 from .users.service import UserService
 from .users.schemas import UserCreate, UserUpdate
@@ -49,10 +52,17 @@ AUTH_ACCESS = dict(
 
 
 async def init_data():
+    async with async_session_maker() as session:
+        await _init_data(session)
+
+
+async def _init_data(session: AsyncSession):
     logger.info("Checking if superuser exists...")
 
     try:
-        superuser = await UserService.get_user_by_email(settings.FIRST_SUPERUSER_EMAIL)
+        superuser = await UserService.get_user_by_email(
+            session, settings.FIRST_SUPERUSER_EMAIL
+        )
     except EntityNotFound:
         superuser = None
 
@@ -69,7 +79,7 @@ async def init_data():
         AccessRoleCreate(name="manager"),
         AccessRoleCreate(name="guest"),
     ]
-    created_roles = await AccessRoleService.add_access_roles(roles)
+    created_roles = await AccessRoleService.add_access_roles(session, roles)
 
     role_map = {r.name: r.id for r in created_roles}
     logger.info(f"Roles created. Admin role id = {role_map['admin']}")
@@ -81,7 +91,9 @@ async def init_data():
         BusinessElementCreate(name="products"),
         BusinessElementCreate(name="orders"),
     ]
-    created_elements = await BusinessElementService.add_business_elements(elements)
+    created_elements = await BusinessElementService.add_business_elements(
+        session, elements
+    )
 
     element_map = {el.name: el.id for el in created_elements}
     logger.info("Business elements created:", element_map)
@@ -141,7 +153,7 @@ async def init_data():
         ),
     ]
 
-    await AccessRuleService.add_access_rules(rules)
+    await AccessRuleService.add_access_rules(session, rules)
     logger.info("Access rules created.")
 
     logger.info("Creating superuser...")
@@ -155,14 +167,14 @@ async def init_data():
         password_repeat=settings.FIRST_SUPERUSER_PASSWORD,
     )
 
-    superuser = await UserService.register_new_user(superuser_data)
+    superuser = await UserService.register_new_user(session, superuser_data)
     logger.info(f"Superuser created: {superuser.email}")
 
     logger.info("Assigning admin role to superuser...")
 
     update_data = UserUpdate(access_role_id=role_map["admin"])
 
-    await UserService.update_user_from_superuser(superuser.id, update_data)
+    await UserService.update_user_from_superuser(session, superuser.id, update_data)
 
     logger.info("Initial data creation completed successfully!")
 
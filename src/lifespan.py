@@ -1,6 +1,7 @@
+import asyncio
 import logging
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
@@ -8,6 +9,11 @@ from sqlalchemy.exc import ProgrammingError
 from asyncpg.exceptions import UndefinedTableError
 
 from .initial_data import init_data
+from .access_control.permissions import permission_matrix
+from .auth.hashing import password_hasher
+from .auth.session_store import refresh_session_store
+from .auth.revocation import token_revocation_list
+from .auth.tasks import run_refresh_session_sweeper, run_token_revocation_refresher
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,4 +30,37 @@ async def lifespan(app: FastAPI):
             "Database tables do not exist yet. " "Skipping initial data initialization."
         )
 
+    logger.info("Loading permission matrix...")
+
+    try:
+        await permission_matrix.load()
+    except (ProgrammingError, UndefinedTableError):
+        logger.warning(
+            "Database tables do not exist yet. Permission matrix will be loaded lazily."
+        )
+
+    logger.info("Loading token revocation list...")
+
+    try:
+        await token_revocation_list.load()
+    except (ProgrammingError, UndefinedTableError):
+        logger.warning(
+            "Database tables do not exist yet. "
+            "Token revocations will be checked against the database."
+        )
+
+    background_tasks = [
+        asyncio.create_task(run_refresh_session_sweeper()),
+        asyncio.create_task(run_token_revocation_refresher()),
+    ]
+
     yield
+
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+    password_hasher.shutdown()
+    await refresh_session_store.close()
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+from weakref import WeakKeyDictionary
+
+from .dao import BaseDAO
+from .database import async_session_maker, replica_session_maker
+from .monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+
+
+@dataclass
+class _LoopState:
+    # Keys waiting for the next dispatch, and every key not yet resolved.
+    pending: list = field(default_factory=list)
+    futures: dict[Any, asyncio.Future] = field(default_factory=dict)
+    tasks: set[asyncio.Task] = field(default_factory=set)
+    primary: bool = False
+
+
+class BatchLoader(Generic[KeyType]):
+    """Coalesces concurrent lookups by one column into `= ANY(:keys)` queries.
+
+    Keys requested during the same event-loop tick are fetched together, and
+    a key that is already in flight is not queried again: every caller
+    awaits the same result. State is kept per event loop, and batches run in
+    their own session, so they only see committed rows. Batches read from a
+    replica unless the caller asks for the primary with `primary=True`.
+
+    `load` returns the row for the key, or `None` when there is none. With
+    `columns` it is a plain `Row`, otherwise a detached entity.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dao: type[BaseDAO],
+        key: str,
+        columns: Sequence[str] | None = None,
+        max_batch_size: int = 500,
+    ):
+        self.dao = dao
+        self.key = key
+        if columns and key not in columns:
+            columns = [key, *columns]
+        self.columns = columns
+        self.max_batch_size = max_batch_size
+        self._states: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[bool, _LoopState]
+        ] = WeakKeyDictionary()
+
+        labels = {"loader": name}
+        self.batches = registry.counter(
+            "loader_batches", "Batched lookup queries issued", labels
+        )
+        self.keys = registry.counter(
+            "loader_keys", "Keys fetched by batched lookup queries", labels
+        )
+        self.coalesced = registry.counter(
+            "loader_coalesced",
+            "Lookups that joined a key already waiting or in flight",
+            labels,
+        )
+
+    async def load(self, key: KeyType, primary: bool = False) -> Any | None:
+        loop = asyncio.get_running_loop()
+        states = self._states.setdefault(loop, {})
+        state = states.get(primary)
+        if state is None:
+            state = states[primary] = _LoopState(primary=primary)
+
+        future = state.futures.get(key)
+        if future is None:
+            future = loop.create_future()
+            state.futures[key] = future
+            state.pending.append(key)
+            if len(state.pending) == 1:
+                loop.call_soon(self._dispatch, state)
+        else:
+            self.coalesced.inc()
+        # A cancelled caller must not cancel the result other callers share.
+        return await asyncio.shield(future)
+
+    def _dispatch(self, state: _LoopState) -> None:
+        keys, state.pending = state.pending, []
+        for start in range(0, len(keys), self.max_batch_size):
+            task = asyncio.create_task(
+                self._fetch(state, keys[start : start + self.max_batch_size])
+            )
+            state.tasks.add(task)
+            task.add_done_callback(state.tasks.discard)
+
+    async def _fetch(self, state: _LoopState, keys: list) -> None:
+        self.batches.inc()
+        self.keys.inc(len(keys))
+        try:
+            session_maker = (
+                async_session_maker if state.primary else replica_session_maker
+            )
+            async with session_maker() as session:
+                rows = await self.dao.find_many(
+                    session, self.key, keys, columns=self.columns
+                )
+        except Exception as e:
+            logger.warning("Batched %s lookup failed: %s", self.key, e)
+            for key in keys:
+                future = state.futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {getattr(row, self.key): row for row in rows}
+        for key in keys:
+            future = state.futures.pop(key)
+            if not future.done():
+                future.set_result(found.get(key))
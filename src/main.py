@@ -11,6 +11,7 @@ from .access_control.access_roles.router import access_role_router
 from .access_control.business_elements.router import business_element_router
 from .access_control.access_rules.router import access_rule_router
 from .mock.router import mock_router
+from .monitoring.router import monitoring_router
 
 
 app = FastAPI(lifespan=lifespan)
@@ -21,6 +22,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=settings.CORS_METHODS,
     allow_headers=settings.CORS_HEADERS,
+    expose_headers=["X-Next-Cursor"],
 )
 
 routers = [
@@ -30,6 +32,7 @@ routers = [
     business_element_router,
     access_rule_router,
     mock_router,
+    monitoring_router,
 ]
 
 for router in routers:
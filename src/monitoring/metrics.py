@@ -0,0 +1,168 @@
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: dict[str, str]):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+
+    @abstractmethod
+    def samples(self) -> list[tuple[str, dict[str, str], float]]: ...
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: dict[str, str],
+        callback: Callable[[], float] | None = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self.value = 0.0
+        self.callback = callback
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def samples(self):
+        value = self.callback() if self.callback else self.value
+        name = self.name if self.name.endswith("_total") else f"{self.name}_total"
+        return [(name, self.labels, value)]
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: dict[str, str],
+        callback: Callable[[], float] | None = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self.value = 0.0
+        self.callback = callback
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self):
+        value = self.callback() if self.callback else self.value
+        return [(self.name, self.labels, value)]
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: dict[str, str],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def samples(self):
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            labels = {**self.labels, "le": _format_value(bound)}
+            samples.append((f"{self.name}_bucket", labels, cumulative))
+        samples.append((f"{self.name}_sum", self.labels, self.sum))
+        samples.append((f"{self.name}_count", self.labels, self.count))
+        return samples
+
+
+class MetricsRegistry:
+    """Minimal in-process registry rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def _register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labels: dict[str, str] | None = None,
+        callback: Callable[[], float] | None = None,
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labels or {}, callback))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labels: dict[str, str] | None = None,
+        callback: Callable[[], float] | None = None,
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labels or {}, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: dict[str, str] | None = None,
+        buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels or {}, buckets))
+
+    def render(self) -> str:
+        families: dict[str, list[Metric]] = {}
+        for metric in self._metrics:
+            families.setdefault(metric.name, []).append(metric)
+
+        lines = []
+        for name, metrics in families.items():
+            lines.append(f"# HELP {name} {metrics[0].documentation}")
+            lines.append(f"# TYPE {name} {metrics[0].type}")
+            for metric in metrics:
+                for sample_name, labels, value in metric.samples():
+                    lines.append(
+                        f"{sample_name}{_format_labels(labels)} {_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,90 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .metrics import Counter, Histogram, registry
+
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait times and timeouts.
+
+    Checkout time includes waiting for a free connection, opening a new one
+    for overflow, and the pre-ping. Use `named()` to get a subclass bound to
+    its metrics and pass that as `poolclass`; the subclass survives the pool
+    being recreated on `engine.dispose()`.
+    """
+
+    name: str
+    checkout_seconds: Histogram
+    checkout_timeouts: Counter
+
+    @classmethod
+    def named(cls, name: str) -> type["InstrumentedPool"]:
+        labels = {"pool": name}
+        return type(
+            cls.__name__,
+            (cls,),
+            {
+                "name": name,
+                "checkout_seconds": registry.histogram(
+                    "db_pool_checkout_seconds",
+                    "Time taken to check a connection out of the pool",
+                    labels,
+                    buckets=CHECKOUT_BUCKETS,
+                ),
+                "checkout_timeouts": registry.counter(
+                    "db_pool_checkout_timeouts_total",
+                    "Checkouts that gave up after DB_POOL_TIMEOUT_SECONDS",
+                    labels,
+                ),
+            },
+        )
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts.inc()
+            raise
+        finally:
+            self.checkout_seconds.observe(time.perf_counter() - start)
+
+
+def register_pool_gauges(name: str, engine: AsyncEngine) -> None:
+    """Export the size and usage of `engine`'s pool under `pool="<name>"`."""
+    labels = {"pool": name}
+    registry.gauge(
+        "db_pool_size",
+        "Connections the pool keeps open, excluding overflow",
+        labels,
+        callback=lambda: engine.pool.size(),
+    )
+    registry.gauge(
+        "db_pool_checked_out",
+        "Connections currently checked out of the pool",
+        labels,
+        callback=lambda: engine.pool.checkedout(),
+    )
+    registry.gauge(
+        "db_pool_overflow",
+        "Connections open beyond the pool size",
+        labels,
+        callback=lambda: max(engine.pool.overflow(), 0),
+    )
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, int]:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
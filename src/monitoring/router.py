@@ -0,0 +1,80 @@
+import asyncio
+import logging
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import settings
+from ..database import engine, probe_engines, replica_engines
+from .metrics import registry
+from .pool import pool_status
+
+logger = logging.getLogger(__name__)
+
+monitoring_router = APIRouter(tags=["monitoring"])
+
+
+@monitoring_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+async def check_database(name: str, db_engine: AsyncEngine) -> dict:
+    try:
+        async with asyncio.timeout(settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+            async with probe_engines[name].connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        available = True
+    except Exception as e:
+        logger.warning("Health check of %s database failed: %r", name, e)
+        available = False
+
+    pool = pool_status(db_engine)
+    # With every connection checked out, requests queue for a free one.
+    saturated = bool(pool) and (
+        pool["checked_out"] >= settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    return {"available": available, "saturated": saturated, **pool}
+
+
+@monitoring_router.get("/health/ready")
+async def get_readiness() -> JSONResponse:
+    """Ready while the primary answers; a replica being down only degrades.
+
+    Reads skip unreachable replicas and fall back to the primary, so the
+    instance keeps serving in that state.
+
+    Each database entry also reports its pool usage. The probe connects
+    outside the pool, so a saturated pool degrades the status instead of
+    making the primary look unavailable and getting the instance restarted.
+    """
+    engines = {"primary": engine}
+    engines.update(
+        (f"replica{index}", replica) for index, replica in enumerate(replica_engines)
+    )
+    results = await asyncio.gather(
+        *(check_database(name, db_engine) for name, db_engine in engines.items())
+    )
+    databases = dict(zip(engines, results))
+
+    if not databases["primary"]["available"]:
+        state = "unavailable"
+    elif all(
+        database["available"] and not database["saturated"] for database in results
+    ):
+        state = "ready"
+    else:
+        state = "degraded"
+
+    return JSONResponse(
+        {"status": state, "databases": databases},
+        status_code=(
+            status.HTTP_503_SERVICE_UNAVAILABLE
+            if state == "unavailable"
+            else status.HTTP_200_OK
+        ),
+    )
@@ -0,0 +1,80 @@
+import csv
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from pydantic import ValidationError
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Columns filled by an import; created_at/modified_at use the table defaults.
+IMPORT_COLUMNS = [
+    "id",
+    "email",
+    "name",
+    "surname",
+    "patronymic",
+    "hashed_password",
+    "is_active",
+    "access_role_id",
+]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without reading all of it first."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+async def parse_records(
+    lines: AsyncIterator[bytes], format: ImportFormat
+) -> AsyncIterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Yield `(line number, record, error)` for every non-blank line.
+
+    CSV input needs a header line; fields may not contain newlines.
+    """
+    header: list[str] | None = None
+    line_number = 0
+    async for raw_line in lines:
+        line_number += 1
+        try:
+            line = raw_line.decode("utf-8").rstrip("\r")
+        except UnicodeDecodeError:
+            yield line_number, None, "Line is not valid UTF-8"
+            continue
+        if not line.strip():
+            continue
+
+        if format == "ndjson":
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Expected a JSON object"
+                continue
+            yield line_number, record, None
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_number, None, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+        yield line_number, dict(zip(header, values)), None
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
@@ -1,3 +1,7 @@
+from sqlalchemy import column, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from .models import UserModel
 from .schemas import UserCreateDB, UserUpdateDB
 from ..dao import BaseDAO
@@ -5,3 +9,46 @@ from ..dao import BaseDAO
 
 class UserDAO(BaseDAO[UserModel, UserCreateDB, UserUpdateDB]):
     model = UserModel
+
+    @classmethod
+    async def find_existing_emails(
+        cls, session: AsyncSession, emails: list[str]
+    ) -> set[str]:
+        result = await session.scalars(
+            select(cls.model.email).where(cls.model.email.in_(emails))
+        )
+        return set(result.all())
+
+    @classmethod
+    async def copy_insert(
+        cls, session: AsyncSession, columns: list[str], records: list[tuple]
+    ) -> set[str]:
+        """Bulk-load users through COPY and return the emails actually inserted.
+
+        Records are streamed with the binary COPY protocol into a temporary
+        table shaped like `users`, then moved over with one INSERT ... SELECT
+        that skips emails which already exist. The temporary table is dropped
+        on commit, so commit between calls.
+        """
+        await session.execute(
+            text(
+                "CREATE TEMPORARY TABLE users_import "
+                "(LIKE users INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        )
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "users_import", records=records, columns=columns
+        )
+
+        users_import = table("users_import", *(column(name) for name in columns))
+        users = cls.model.__table__
+        statement = (
+            insert(users)
+            .from_select(columns, select(*users_import.c))
+            .on_conflict_do_nothing(index_elements=[users.c.email])
+            .returning(users.c.email)
+        )
+        result = await session.execute(statement)
+        return set(result.scalars().all())
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_FIELDS = (
+    "id",
+    "email",
+    "name",
+    "surname",
+    "patronymic",
+    "is_active",
+    "access_role_id",
+    "created_at",
+)
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_chunks(batches: AsyncIterator[list]) -> AsyncIterator[str]:
+    """One JSON object per line; each batch of rows becomes one chunk."""
+    async for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_default) + "\n"
+            for row in batch
+        )
+
+
+def _csv_row(row) -> list[Any]:
+    return [
+        value.isoformat() if isinstance(value, datetime) else value for value in row
+    ]
+
+
+async def csv_chunks(batches: AsyncIterator[list]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    async for batch in batches:
+        writer.writerows(_csv_row(row) for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when there were no rows at all.
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -1,15 +1,18 @@
 from uuid import UUID, uuid4
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID as pgUUID
 
+from ..constants import DEFAULT_ACCESS_ROLE_ID
 from ..database import Base
 
 
 class UserModel(Base):
     __tablename__ = "users"
 
+    __table_args__ = (Index("users_created_at_id_idx", "created_at", "id"),)
+
     id: Mapped[UUID] = mapped_column(
         pgUUID, primary_key=True, index=True, default=uuid4
     )
@@ -22,5 +25,5 @@ class UserModel(Base):
     access_role_id: Mapped[int | None] = mapped_column(
         ForeignKey("access_roles.id", ondelete="SET NULL"),
         nullable=True,
-        default=1,
+        default=DEFAULT_ACCESS_ROLE_ID,
     )
@@ -3,14 +3,20 @@ from uuid import UUID
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query, Path, Response, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import Message
+from ..database import Message, get_session
 from ..access_control.dependencies import BusinessElement, PermissionAction, Permit
 
-from .schemas import User, UserUpdate
+from .export import MEDIA_TYPES, ExportFormat
+from .bulk_import import ImportFormat
+from .schemas import User, UserImportReport, UserUpdate
 from .service import UserService
 from ..auth.service import AuthService
+from ..auth.principal import Principal
 from ..auth.dependencies import (
+    get_access_token_claims,
     get_current_user,
     get_current_active_user,
 )
@@ -24,10 +30,56 @@ user_router = APIRouter(prefix="/users", tags=["user"])
     response_model=list[User],
 )
 async def get_users_list(
+    response: Response,
     offset: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
+    session: AsyncSession = Depends(get_session),
 ) -> list[User]:
-    return await UserService.get_users_list(offset=offset, limit=limit)
+    # The body stays a bare list for existing clients; the cursor of the next
+    # page travels in a header instead.
+    users, next_cursor = await UserService.get_users_list(
+        session, offset=offset, limit=limit, cursor=cursor
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
+
+
+@user_router.get(
+    "/export",
+    dependencies=[Permit(BusinessElement.USERS, PermissionAction.READ_ALL)],
+    response_class=StreamingResponse,
+)
+async def export_users(
+    format: Annotated[ExportFormat, Query()] = "ndjson",
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    # The session outlives the handler: request-scoped dependencies are only
+    # closed after the response body has been streamed.
+    return StreamingResponse(
+        UserService.export_users(session, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
+@user_router.post(
+    "/import",
+    # Creating accounts for other people is an administrative action, so
+    # plain CREATE (self-registration) is not enough.
+    dependencies=[
+        Permit(BusinessElement.USERS, PermissionAction.CREATE),
+        Permit(BusinessElement.USERS, PermissionAction.UPDATE_ALL),
+    ],
+    response_model=UserImportReport,
+)
+async def import_users(
+    request: Request,
+    format: Annotated[ImportFormat, Query()] = "ndjson",
+    session: AsyncSession = Depends(get_session),
+) -> UserImportReport:
+    return await UserService.import_users(session, request.stream(), format)
 
 
 @user_router.get(
@@ -36,9 +88,10 @@ async def get_users_list(
     response_model=User,
 )
 async def get_user_self(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
 ) -> User:
-    return await UserService.get_user(current_user.id)
+    return await UserService.get_user(session, current_user.id)
 
 
 @user_router.put(
@@ -48,9 +101,10 @@ async def get_user_self(
 )
 async def update_current_user(
     user: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ) -> User:
-    return await UserService.update_user(current_user.id, user)
+    return await UserService.update_user(session, current_user, user)
 
 
 @user_router.delete(
@@ -61,13 +115,19 @@ async def update_current_user(
 async def delete_current_user(
     request: Request,
     response: Response,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    claims: dict = Depends(get_access_token_claims),
+    session: AsyncSession = Depends(get_session),
 ) -> Message:
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
 
-    await AuthService.logout(request.cookies.get("refresh_token"))
-    await UserService.delete_user(current_user.id)
+    refresh_token = request.cookies.get("refresh_token")
+    # delete_user commits the logout together with the deactivation.
+    await AuthService.logout(
+        session, UUID(refresh_token) if refresh_token else None, claims, commit=False
+    )
+    await UserService.delete_user(session, current_user)
     return Message(message="User deleted successfully")
 
 
@@ -78,8 +138,9 @@ async def delete_current_user(
 )
 async def get_user(
     user_id: UUID = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> User:
-    return await UserService.get_user(user_id)
+    return await UserService.get_user(session, user_id)
 
 
 @user_router.put(
@@ -90,8 +151,9 @@ async def get_user(
 async def update_user(
     user: UserUpdate,
     user_id: UUID = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> User:
-    return await UserService.update_user_from_superuser(user_id, user)
+    return await UserService.update_user_from_superuser(session, user_id, user)
 
 
 @user_router.delete(
@@ -101,6 +163,7 @@ async def update_user(
 )
 async def delete_user(
     user_id: UUID = Path(...),
+    session: AsyncSession = Depends(get_session),
 ) -> Message:
-    await UserService.delete_user_from_superuser(user_id)
+    await UserService.delete_user_from_superuser(session, user_id)
     return Message(message="User was deleted")
@@ -1,3 +1,4 @@
+from typing import ClassVar, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, model_validator
@@ -59,3 +60,46 @@ class UserCreateDB(UserBase):
 
 class UserUpdateDB(UserBase):
     hashed_password: str
+
+
+class UserImport(BaseModel):
+    email: EmailStr
+    name: str = Field(max_length=50)
+    surname: str = Field(max_length=50)
+    patronymic: str = Field(max_length=50)
+    password: str = Field(min_length=1)
+
+
+class UserImportError(BaseModel):
+    line: int
+    email: str | None = Field(None)
+    error: Literal["invalid", "duplicate"]
+    detail: str | None = Field(None)
+
+
+class UserImportReport(BaseModel):
+    # Only the first errors are itemized; the counters cover all of them.
+    MAX_ERRORS: ClassVar[int] = 1000
+
+    total: int = 0
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list[UserImportError] = Field(default_factory=list)
+    errors_truncated: bool = False
+
+    def _add_error(self, error: UserImportError) -> None:
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(error)
+        else:
+            self.errors_truncated = True
+
+    def add_duplicate(self, line: int, email: str) -> None:
+        self.duplicates += 1
+        self._add_error(UserImportError(line=line, email=email, error="duplicate"))
+
+    def add_invalid(self, line: int, email: str | None, detail: str) -> None:
+        self.invalid += 1
+        self._add_error(
+            UserImportError(line=line, email=email, error="invalid", detail=detail)
+        )
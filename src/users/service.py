@@ -1,125 +1,293 @@
-from uuid import UUID
+from collections.abc import AsyncIterator
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.exceptions import EntityAlreadyExists, EntityNotFound
 
-from ..database import async_session_maker
-from ..auth.utils import get_password_hash
+from ..cache import TTLCache
+from ..config import settings
+from ..constants import DEFAULT_ACCESS_ROLE_ID
+from ..database import uses_primary
+from ..loader import BatchLoader
+from ..monitoring.metrics import registry
+from ..auth.hashing import PasswordHasher, password_hasher
+from ..auth.principal import Principal
 from .schemas import (
+    User,
     UserCreate,
     UserUpdate,
     UserCreateDB,
     UserUpdateDB,
+    UserImport,
+    UserImportReport,
 )
 from .models import UserModel
 from .dao import UserDAO
+from .export import EXPORT_FIELDS, ExportFormat, csv_chunks, ndjson_chunks
+from .bulk_import import (
+    IMPORT_COLUMNS,
+    ImportFormat,
+    format_validation_error,
+    iter_lines,
+    parse_records,
+)
+
+# Columns read for list responses and auth checks; the rest of the row
+# (password hash, timestamps) is never sent over the wire for them.
+USER_COLUMNS = tuple(User.model_fields)
+PRINCIPAL_COLUMNS = ("id", "is_active", "access_role_id")
+
+# Principal cache misses from concurrent requests share one
+# `id = ANY(:keys)` query.
+principal_loader: BatchLoader[UUID] = BatchLoader(
+    "user_principal", UserDAO, "id", columns=PRINCIPAL_COLUMNS
+)
+
+principal_cache: TTLCache[UUID, Principal] = TTLCache(
+    settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS
+)
+
+registry.counter(
+    "user_cache_hits",
+    "Principal lookups served from the in-process user cache",
+    callback=lambda: principal_cache.hits,
+)
+registry.counter(
+    "user_cache_misses",
+    "Principal lookups that had to query the users table",
+    callback=lambda: principal_cache.misses,
+)
 
 
 class UserService:
     @classmethod
-    async def register_new_user(cls, user: UserCreate) -> UserModel:
-        async with async_session_maker() as session:
-            user_exist = await UserDAO.find_one_or_none(session, email=user.email)
-            if user_exist:
-                raise EntityAlreadyExists("user")
-
-            db_user = await UserDAO.add(
-                session,
-                UserCreateDB(
-                    **user.model_dump(
-                        exclude={"password", "password_repeat"},
-                    ),
-                    hashed_password=get_password_hash(user.password)
+    async def register_new_user(
+        cls, session: AsyncSession, user: UserCreate
+    ) -> UserModel:
+        db_user = await UserDAO.add_unique(
+            session,
+            UserCreateDB(
+                **user.model_dump(
+                    exclude={"password", "password_repeat"},
                 ),
-            )
-            await session.commit()
+                hashed_password=await password_hasher.hash(user.password)
+            ),
+        )
+        if db_user is None:
+            raise EntityAlreadyExists("user")
+        await session.commit()
         return db_user
 
     @classmethod
-    async def get_user(cls, user_id: UUID) -> UserModel:
-        async with async_session_maker() as session:
-            db_user = await UserDAO.find_one_or_none(session, id=user_id)
+    async def get_user(cls, session: AsyncSession, user_id: UUID) -> UserModel:
+        db_user = await UserDAO.find_one_or_none(session, id=user_id)
         if db_user is None:
             raise EntityNotFound("user")
         return db_user
 
     @classmethod
-    async def get_user_by_email(cls, email: str) -> UserModel:
-        async with async_session_maker() as session:
-            db_user = await UserDAO.find_one_or_none(session, email=email)
+    async def get_principal(cls, session: AsyncSession, user_id: UUID) -> Principal:
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+        # Every authenticated request resolves a principal before its handler
+        # runs, so misses are what bursts are made of; the loader batches them
+        # across requests in its own session. Nothing has been written yet at
+        # that point, so committed rows are all there is to see.
+        row = await principal_loader.load(user_id, primary=uses_primary(session))
+        if row is None:
+            raise EntityNotFound("user")
+        principal = Principal(**row._asdict())
+        principal_cache.set(user_id, principal)
+        return principal
+
+    @classmethod
+    async def get_user_by_email(cls, session: AsyncSession, email: str) -> UserModel:
+        db_user = await UserDAO.find_one_or_none(session, email=email)
         if db_user is None:
             raise EntityNotFound("user")
         return db_user
 
     @classmethod
-    async def update_user(cls, user_id: UUID, user: UserUpdate) -> UserModel:
-        async with async_session_maker() as session:
-            db_user = await UserDAO.find_one_or_none(session, UserModel.id == user_id)
-            if db_user is None:
-                raise EntityNotFound("user")
-
-            if user.password:
-                user_in = UserUpdateDB(
-                    **user.model_dump(
-                        exclude={
-                            "is_active",
-                            "access_role_id",
-                            "password",
-                            "password_repeat",
-                        },
-                        exclude_unset=True,
-                    ),
-                    hashed_password=get_password_hash(user.password)
-                )
-            else:
-                user_in = user.model_dump(exclude_unset=True)
-
-            user_update = await UserDAO.update(
-                session, UserModel.id == user_id, object_in=user_in
+    async def update_user(
+        cls, session: AsyncSession, principal: Principal, user: UserUpdate
+    ) -> UserModel:
+        if user.password:
+            user_in = UserUpdateDB(
+                **user.model_dump(
+                    exclude={
+                        "is_active",
+                        "access_role_id",
+                        "password",
+                        "password_repeat",
+                    },
+                    exclude_unset=True,
+                ),
+                hashed_password=await password_hasher.hash(user.password)
             )
-            await session.commit()
-            return user_update
+        else:
+            user_in = user.model_dump(exclude_unset=True)
+
+        user_update = await UserDAO.update(
+            session, UserModel.id == principal.id, object_in=user_in
+        )
+        if user_update is None:
+            raise EntityNotFound("user")
+        await session.commit()
+        principal_cache.pop(principal.id)
+        return user_update
 
     @classmethod
-    async def delete_user(cls, user_id: UUID) -> None:
-        async with async_session_maker() as session:
-            db_user = await UserDAO.find_one_or_none(session, id=user_id)
-            if db_user is None:
-                raise EntityNotFound("user")
-            await UserDAO.update(
-                session, UserModel.id == user_id, object_in={"is_active": False}
-            )
-            await session.commit()
+    async def delete_user(cls, session: AsyncSession, principal: Principal) -> None:
+        db_user = await UserDAO.update(
+            session, UserModel.id == principal.id, object_in={"is_active": False}
+        )
+        if db_user is None:
+            raise EntityNotFound("user")
+        await session.commit()
+        principal_cache.pop(principal.id)
 
     @classmethod
     async def get_users_list(
-        cls, *filter, offset: int = 0, limit: int = 100, **filter_by
-    ) -> list[UserModel]:
-        async with async_session_maker() as session:
-            users = await UserDAO.find_all(
-                session, *filter, offset=offset, limit=limit, **filter_by
-            )
+        cls,
+        session: AsyncSession,
+        *filter,
+        offset: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        **filter_by
+    ) -> tuple[list[Row], str | None]:
+        users, next_cursor = await UserDAO.find_page(
+            session,
+            *filter,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            columns=USER_COLUMNS,
+            **filter_by
+        )
         if not users:
             raise EntityNotFound("user")
-        return users
+        return users, next_cursor
 
     @classmethod
     async def update_user_from_superuser(
-        cls, user_id: UUID, user: UserUpdate
+        cls, session: AsyncSession, user_id: UUID, user: UserUpdate
     ) -> UserModel:
-        async with async_session_maker() as session:
-            db_user = await UserDAO.find_one_or_none(session, UserModel.id == user_id)
-            if db_user is None:
-                raise EntityNotFound("user")
+        user_in = user.model_dump(exclude_unset=True)
+        user_update = await UserDAO.update(
+            session, UserModel.id == user_id, object_in=user_in
+        )
+        if user_update is None:
+            raise EntityNotFound("user")
+        await session.commit()
+        principal_cache.pop(user_id)
+        return user_update
 
-            user_in = user.model_dump(exclude_unset=True)
-            user_update = await UserDAO.update(
-                session, UserModel.id == user_id, object_in=user_in
-            )
-            await session.commit()
-            return user_update
+    @classmethod
+    async def delete_user_from_superuser(
+        cls, session: AsyncSession, user_id: UUID
+    ) -> None:
+        deleted = await UserDAO.delete(session, UserModel.id == user_id)
+        if not deleted:
+            raise EntityNotFound("user")
+        await session.commit()
+        principal_cache.pop(user_id)
 
     @classmethod
-    async def delete_user_from_superuser(cls, user_id: UUID) -> None:
-        async with async_session_maker() as session:
-            await UserDAO.delete(session, UserModel.id == user_id)
-            await session.commit()
+    def export_users(
+        cls, session: AsyncSession, format: ExportFormat
+    ) -> AsyncIterator[str]:
+        batches = UserDAO.stream(
+            session,
+            columns=EXPORT_FIELDS,
+            batch_size=settings.USER_EXPORT_BATCH_SIZE,
+        )
+        if format == "csv":
+            return csv_chunks(batches)
+        return ndjson_chunks(batches)
+
+    @classmethod
+    async def import_users(
+        cls,
+        session: AsyncSession,
+        chunks: AsyncIterator[bytes],
+        format: ImportFormat,
+        hasher: PasswordHasher = password_hasher,
+    ) -> UserImportReport:
+        """Create users from a CSV/NDJSON byte stream, one chunk per commit.
+
+        Bad lines and already-taken emails are reported by line number and
+        skipped; everything else is imported.
+        """
+        report = UserImportReport()
+        chunk: list[tuple[int, UserImport]] = []
+        async for line, record, error in parse_records(iter_lines(chunks), format):
+            report.total += 1
+            if error is None:
+                try:
+                    chunk.append((line, UserImport.model_validate(record)))
+                except ValidationError as e:
+                    error = format_validation_error(e)
+            if error is not None:
+                email = record.get("email") if record else None
+                if not isinstance(email, str):
+                    email = None
+                report.add_invalid(line, email, error)
+                continue
+
+            if len(chunk) >= settings.USER_IMPORT_CHUNK_SIZE:
+                await cls._import_chunk(session, chunk, report, hasher)
+                chunk = []
+        if chunk:
+            await cls._import_chunk(session, chunk, report, hasher)
+        return report
+
+    @classmethod
+    async def _import_chunk(
+        cls,
+        session: AsyncSession,
+        chunk: list[tuple[int, UserImport]],
+        report: UserImportReport,
+        hasher: PasswordHasher,
+    ) -> None:
+        pending: dict[str, tuple[int, UserImport]] = {}
+        for line, user in chunk:
+            if user.email in pending:
+                report.add_duplicate(line, user.email)
+            else:
+                pending[user.email] = (line, user)
+
+        # Skip bcrypt for emails that are taken already, e.g. on a re-run.
+        for email in await UserDAO.find_existing_emails(session, list(pending)):
+            report.add_duplicate(pending.pop(email)[0], email)
+        if not pending:
+            return
+
+        users = [user for _, user in pending.values()]
+        hashed_passwords = await hasher.hash_many([user.password for user in users])
+        records = [
+            (
+                uuid4(),
+                user.email,
+                user.name,
+                user.surname,
+                user.patronymic,
+                hashed_password,
+                True,
+                DEFAULT_ACCESS_ROLE_ID,
+            )
+            for user, hashed_password in zip(users, hashed_passwords)
+        ]
+        inserted = await UserDAO.copy_insert(session, IMPORT_COLUMNS, records)
+        await session.commit()
+
+        report.created += len(inserted)
+        # Lost a race with a concurrent insert of the same email.
+        for email, (line, _) in pending.items():
+            if email not in inserted:
+                report.add_duplicate(line, email)
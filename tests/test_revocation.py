@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+from src.auth import revocation
+from src.auth.revocation import TokenRevocationList
+
+
+def _stub_table(monkeypatch, rows, reading: asyncio.Event, release: asyncio.Event):
+    @asynccontextmanager
+    async def session_maker():
+        yield None
+
+    async def find_active(session):
+        reading.set()
+        await release.wait()
+        return rows
+
+    monkeypatch.setattr(revocation, "replica_session_maker", session_maker)
+    monkeypatch.setattr(revocation.TokenRevocationDAO, "find_active", find_active)
+
+
+def test_load_keeps_revocations_added_while_reading(monkeypatch):
+    stored_user, stored_jti = uuid4(), uuid4()
+    user_id, jti = uuid4(), uuid4()
+    aborted_user = uuid4()
+
+    async def scenario():
+        reading, release = asyncio.Event(), asyncio.Event()
+        # The snapshot predates the two revocations added below.
+        _stub_table(monkeypatch, [(stored_user, stored_jti)], reading, release)
+        revocations = TokenRevocationList(false_positive_rate=1e-6)
+
+        load = asyncio.create_task(revocations.load())
+        await reading.wait()
+        revocations.add(user_id, jti)
+        revocations.add(aborted_user)
+        release.set()
+        await load
+        return revocations
+
+    revocations = asyncio.run(scenario())
+
+    bloom = revocations._filter
+    assert revocations._key(stored_user, stored_jti) in bloom
+    assert revocations._key(user_id, jti) in bloom
+    assert revocations._key(aborted_user, None) in bloom
+    assert revocations._loading == []
+
+
+def test_overlapping_loads_each_replay_their_additions(monkeypatch):
+    user_id, jti = uuid4(), uuid4()
+
+    async def scenario():
+        reading, release = asyncio.Event(), asyncio.Event()
+        _stub_table(monkeypatch, [], reading, release)
+        revocations = TokenRevocationList(false_positive_rate=1e-6)
+
+        first = asyncio.create_task(revocations.load())
+        second = asyncio.create_task(revocations.load())
+        await reading.wait()
+        await asyncio.sleep(0)
+        revocations.add(user_id, jti)
+        release.set()
+        await asyncio.gather(first, second)
+        return revocations
+
+    revocations = asyncio.run(scenario())
+
+    assert revocations._key(user_id, jti) in revocations._filter
+    assert revocations._loading == []